@@ -0,0 +1,230 @@
+"""
+Headless benchmarks and load tests. No Discord connection needed.
+
+    python bench.py tournament --entrants 1000
+    python bench.py bot --hands 200 --deadline 0.2
+    python bench.py variants --hands 2000 --players 6
+    python bench.py shuffle --hands 20000
+"""
+import argparse
+import os
+import random
+import time
+from itertools import combinations
+
+import bot_player
+import shuffle
+from hand_evaluator import evaluate_5
+from headless import play_hand, random_policy
+from table import PokerTable
+from tournament import BlindClock, Tournament
+from variants import PLO, VARIANTS
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def simulate_tournament(entrants, seats=9, stack=1500, hand_seconds=60, level_seconds=900, seed=None):
+    """
+    Play a full tournament with random policies. Tables deal in round-robin
+    and each round of hands advances the virtual clock by `hand_seconds`.
+    """
+    rng = random.Random(seed)
+    if seed is not None:
+        shuffle.use_seed(seed)  # reproducible decks
+    clock = BlindClock(level_seconds=level_seconds, started_at=0)
+    tourney = Tournament([(i, f"player{i}") for i in range(entrants)], stack, seats=seats, clock=clock, rng=rng)
+    policy = random_policy(rng)
+
+    stats = {"hands": 0, "rebalance_s": 0.0, "eliminations": 0, "max_spread": 0}
+    now = 0
+    while not tourney.finished:
+        for cid in list(tourney.tables):
+            if cid not in tourney.tables:  # broken earlier this round
+                continue
+            tourney.seat_arrivals(cid)
+            if play_hand(tourney.tables[cid], policy) is None:
+                continue
+            stats["hands"] += 1
+
+            start = time.perf_counter()
+            busted, _ = tourney.hand_complete(cid)
+            stats["rebalance_s"] += time.perf_counter() - start
+            stats["eliminations"] += len(busted)
+            counts = tourney._count.values()
+            stats["max_spread"] = max(stats["max_spread"], max(counts) - min(counts))
+            if tourney.finished:
+                break
+        now += hand_seconds
+        tourney.tick(now)
+
+    stats.update(moves=tourney.moves, tables_broken=tourney.tables_broken, level=tourney.level,
+                 winner=tourney.standings()[0].name)
+    return stats
+
+
+def bench_tournament(args):
+    start = time.perf_counter()
+    stats = simulate_tournament(args.entrants, seats=args.seats, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    per_elim = stats["rebalance_s"] / max(1, stats["eliminations"])
+    print(f"entrants={args.entrants} seats={args.seats} hands={stats['hands']} "
+          f"moves={stats['moves']} broken={stats['tables_broken']} final_level={stats['level']}")
+    print(f"total {elapsed:.2f}s | {stats['hands'] / elapsed:.0f} hands/s | "
+          f"rebalance {per_elim * 1e6:.1f}us per elimination | max table spread {stats['max_spread']}")
+    print(f"winner: {stats['winner']}")
+
+
+def bench_bot(args):
+    """Heads-up bot self-play: decision latency against the deadline and hands/sec."""
+    rng = random.Random(args.seed)
+    t = PokerTable(0, 10, 20, 2000, 2000)
+    for uid in (-1, -2):
+        t.add_player(uid, f"bot{-uid}", is_bot=True)
+
+    latencies = []
+    def policy(table, p):
+        start = time.perf_counter()
+        decision = bot_player.choose_action(table, p, args.deadline, rng)
+        latencies.append(time.perf_counter() - start)
+        return decision
+
+    hands = 0
+    start = time.perf_counter()
+    while hands < args.hands:
+        for p in t.players:
+            if p.stack == 0:
+                p.stack = 2000  # rebuy so the match keeps going
+        play_hand(t, policy)
+        hands += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"hands={hands} decisions={len(latencies)} deadline={args.deadline * 1000:.0f}ms")
+    print(f"latency p50 {percentile(latencies, 50) * 1000:.1f}ms | p99 {percentile(latencies, 99) * 1000:.1f}ms | "
+          f"max {max(latencies) * 1000:.1f}ms | over deadline {sum(x > args.deadline for x in latencies)}")
+    print(f"{hands / elapsed:.1f} hands/s")
+
+
+def bench_variants(args):
+    """Per-variant showdown evaluation and headless hand throughput, plus the Omaha fast path vs brute force."""
+    rng = random.Random(args.seed)
+    for variant in VARIANTS.values():
+        variant.tables  # build lookup tables outside the timings
+        deals = []
+        for _ in range(args.hands):
+            deck = rng.sample(variant.deck(), variant.hole_cards * args.players + 5)
+            board = deck[:5]
+            holes = [deck[5 + i * variant.hole_cards:5 + (i + 1) * variant.hole_cards] for i in range(args.players)]
+            deals.append([(h, board) for h in holes])
+        start = time.perf_counter()
+        for hands in deals:
+            variant.evaluate_batch(hands)
+        eval_s = time.perf_counter() - start
+
+        if args.seed is not None:
+            shuffle.use_seed((args.seed, variant.key))  # reproducible decks
+        t = PokerTable(0, 10, 20, 2000, 2000, variant)
+        for uid in range(args.players):
+            t.add_player(uid, f"player{uid}")
+        policy = random_policy(rng)
+        start = time.perf_counter()
+        for _ in range(args.hands):
+            for p in t.players:
+                if p.stack == 0:
+                    p.stack = 2000
+            play_hand(t, policy)
+        play_s = time.perf_counter() - start
+        print(f"{variant.name:<24} showdowns {args.hands / eval_s:>8.0f}/s "
+              f"({eval_s / (args.hands * args.players) * 1e6:.1f}us per hand scored) | "
+              f"headless {args.hands / play_s:.0f} hands/s")
+
+    # Omaha: 60 evaluate_5 calls per hand (sorting + counting each time) vs prime-product lookups
+    sample = [rng.sample(PLO.deck(), 9) for _ in range(min(args.hands, 2000))]
+    start = time.perf_counter()
+    for cards in sample:
+        max(evaluate_5(list(h) + list(b))[0] for h in combinations(cards[:4], 2) for b in combinations(cards[4:], 3))
+    brute = time.perf_counter() - start
+    start = time.perf_counter()
+    for cards in sample:
+        PLO.score(cards[:4], cards[4:])
+    fast = time.perf_counter() - start
+    print(f"PLO best hand: brute force {brute / len(sample) * 1e6:.0f}us | "
+          f"lookup {fast / len(sample) * 1e6:.0f}us | {brute / fast:.1f}x")
+
+
+def bench_shuffle(args):
+    """Deal latency: per-hand random.shuffle vs seeded SHAKE shuffle inline vs the precomputing service."""
+    n = args.hands
+    start = time.perf_counter()
+    for _ in range(n):
+        deck = [(r, s) for r in range(13) for s in range(4)]
+        random.shuffle(deck)
+    mt = time.perf_counter() - start
+
+    seeds = [os.urandom(shuffle.SEED_BYTES) for _ in range(n)]
+    start = time.perf_counter()
+    for seed in seeds:
+        shuffle.deck_from_seed(seed)
+    inline = time.perf_counter() - start
+
+    svc = shuffle.ShuffleService(depth=min(n, shuffle.DEPTH))
+    svc.start()
+    while svc.ready() < svc.depth:
+        time.sleep(0.01)
+    # deal at table pace: one hand, then let the thread top the queue back up
+    waits = []
+    for _ in range(min(n, 2000)):
+        start = time.perf_counter()
+        svc.deal()
+        waits.append(time.perf_counter() - start)
+        time.sleep(0.0002)
+    svc.close()
+    dealt = len(waits)
+
+    print(f"random.shuffle (Mersenne Twister): {mt / n * 1e6:.1f}us per deck")
+    print(f"seeded SHAKE-256 Fisher-Yates inline: {inline / n * 1e6:.1f}us per deck")
+    print(f"shuffle service deal: p50 {percentile(waits, 50) * 1e6:.1f}us p99 {percentile(waits, 99) * 1e6:.1f}us | "
+          f"{svc.entropy_reads} os.urandom reads for {dealt} hands")
+
+    shuffle.use_seed(args.seed if args.seed is not None else 0)
+    first = [shuffle.deal()[0] for _ in range(5)]
+    shuffle.use_seed(args.seed if args.seed is not None else 0)
+    print("seeded mode reproducible:", first == [shuffle.deal()[0] for _ in range(5)])
+    shuffle.use_seed(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("tournament", help="multi-table tournament with random players")
+    p.add_argument("--entrants", type=int, default=1000)
+    p.add_argument("--seats", type=int, default=9)
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=bench_tournament)
+
+    p = sub.add_parser("bot", help="bot self-play latency and throughput")
+    p.add_argument("--hands", type=int, default=200)
+    p.add_argument("--deadline", type=float, default=bot_player.DEFAULT_DEADLINE)
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=bench_bot)
+
+    p = sub.add_parser("variants", help="showdown and hand throughput per game variant")
+    p.add_argument("--hands", type=int, default=2000)
+    p.add_argument("--players", type=int, default=6)
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=bench_variants)
+
+    p = sub.add_parser("shuffle", help="deal latency of the shuffle service vs random.shuffle")
+    p.add_argument("--hands", type=int, default=20000)
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=bench_shuffle)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import random
+import time
+from hand_evaluator import evaluate_7, RANKS
+import tracing
+
+BOT_NAME = "PokerBot 🤖"
+DEFAULT_DEADLINE = float(os.getenv("POKER_BOT_DEADLINE_MS", "200")) / 1000  # seconds per decision
+
+FULL_DECK = [(r, s) for r in range(13) for s in range(4)]
+
+
+# ===== Preflop equity table =====
+def preflop_key(hole):
+    """Starting hand class, e.g. 'AA', 'AKs', 'T9o'."""
+    (r1, s1), (r2, s2) = sorted(hole, reverse=True)
+    if r1 == r2:
+        return RANKS[r1] * 2
+    return RANKS[r1] + RANKS[r2] + ("s" if s1 == s2 else "o")
+
+def build_preflop_table(samples=30000, rng=random):
+    """Monte Carlo heads-up equity of each of the 169 classes vs a random hand. Used to regenerate PREFLOP_EQUITY."""
+    table = {}
+    for r1 in range(12, -1, -1):
+        for r2 in range(r1, -1, -1):
+            for suited in ([False] if r1 == r2 else [True, False]):
+                hole = [(r1, 0), (r2, 0 if suited else 1)]
+                table[preflop_key(hole)] = round(sample_equity(hole, [], 1, samples=samples, rng=rng), 4)
+    return table
+
+# Generated with build_preflop_table(samples=30000)
+PREFLOP_EQUITY = {
+    'AA': 0.8516, 'AKs': 0.6702, 'AKo': 0.6504, 'AQs': 0.6653, 'AQo': 0.6408, 'AJs': 0.6583, 'AJo': 0.6379, 'ATs': 0.6492,
+    'ATo': 0.6229, 'A9s': 0.6302, 'A9o': 0.6044, 'A8s': 0.6205, 'A8o': 0.5992, 'A7s': 0.6109, 'A7o': 0.5889, 'A6s': 0.599,
+    'A6o': 0.5807, 'A5s': 0.5992, 'A5o': 0.581, 'A4s': 0.5905, 'A4o': 0.5664, 'A3s': 0.5805, 'A3o': 0.5613, 'A2s': 0.5686,
+    'A2o': 0.549, 'KK': 0.8235, 'KQs': 0.6375, 'KQo': 0.6138, 'KJs': 0.6229, 'KJo': 0.6098, 'KTs': 0.6149, 'KTo': 0.5958,
+    'K9s': 0.5972, 'K9o': 0.5784, 'K8s': 0.5867, 'K8o': 0.5638, 'K7s': 0.5764, 'K7o': 0.5501, 'K6s': 0.5671, 'K6o': 0.5418,
+    'K5s': 0.5595, 'K5o': 0.5344, 'K4s': 0.5508, 'K4o': 0.5246, 'K3s': 0.5331, 'K3o': 0.5169, 'K2s': 0.5332, 'K2o': 0.5045,
+    'QQ': 0.7971, 'QJs': 0.6066, 'QJo': 0.5804, 'QTs': 0.5916, 'QTo': 0.569, 'Q9s': 0.5797, 'Q9o': 0.5575, 'Q8s': 0.5631,
+    'Q8o': 0.5384, 'Q7s': 0.5441, 'Q7o': 0.5139, 'Q6s': 0.5374, 'Q6o': 0.5131, 'Q5s': 0.5254, 'Q5o': 0.5024, 'Q4s': 0.5163,
+    'Q4o': 0.495, 'Q3s': 0.5098, 'Q3o': 0.4873, 'Q2s': 0.5008, 'Q2o': 0.471, 'JJ': 0.7727, 'JTs': 0.5771, 'JTo': 0.5502,
+    'J9s': 0.5574, 'J9o': 0.5263, 'J8s': 0.5375, 'J8o': 0.5143, 'J7s': 0.5222, 'J7o': 0.4969, 'J6s': 0.5076, 'J6o': 0.4814,
+    'J5s': 0.4953, 'J5o': 0.4717, 'J4s': 0.4926, 'J4o': 0.4626, 'J3s': 0.482, 'J3o': 0.4526, 'J2s': 0.4734, 'J2o': 0.4416,
+    'TT': 0.7545, 'T9s': 0.5426, 'T9o': 0.5122, 'T8s': 0.5287, 'T8o': 0.497, 'T7s': 0.505, 'T7o': 0.4839, 'T6s': 0.4883,
+    'T6o': 0.4539, 'T5s': 0.4759, 'T5o': 0.4397, 'T4s': 0.4667, 'T4o': 0.437, 'T3s': 0.4545, 'T3o': 0.4268, 'T2s': 0.4471,
+    'T2o': 0.4153, '99': 0.7209, '98s': 0.5088, '98o': 0.4829, '97s': 0.4905, '97o': 0.458, '96s': 0.4763, '96o': 0.4411,
+    '95s': 0.4553, '95o': 0.4255, '94s': 0.4405, '94o': 0.4043, '93s': 0.4348, '93o': 0.392, '92s': 0.4248, '92o': 0.3885,
+    '88': 0.6857, '87s': 0.4802, '87o': 0.4548, '86s': 0.4624, '86o': 0.4363, '85s': 0.4501, '85o': 0.4113, '84s': 0.4282,
+    '84o': 0.3988, '83s': 0.4036, '83o': 0.375, '82s': 0.4082, '82o': 0.3696, '77': 0.6612, '76s': 0.4593, '76o': 0.423,
+    '75s': 0.439, '75o': 0.4089, '74s': 0.4127, '74o': 0.3863, '73s': 0.3968, '73o': 0.3671, '72s': 0.382, '72o': 0.3492,
+    '66': 0.6304, '65s': 0.4337, '65o': 0.4025, '64s': 0.416, '64o': 0.3777, '63s': 0.3955, '63o': 0.3604, '62s': 0.3769,
+    '62o': 0.3457, '55': 0.6021, '54s': 0.4151, '54o': 0.3853, '53s': 0.3989, '53o': 0.3659, '52s': 0.3752, '52o': 0.3452,
+    '44': 0.5686, '43s': 0.3842, '43o': 0.3521, '42s': 0.3699, '42o': 0.3357, '33': 0.5403, '32s': 0.3624, '32o': 0.3265,
+    '22': 0.5039,
+}
+
+
+# ===== Equity search =====
+def sample_equity(hole, board, opponents, samples=None, deadline=None, rng=random):
+    """
+    Monte Carlo equity of `hole` against `opponents` random hands, ties split.
+    Anytime: stops after `samples` runouts or at `deadline` (time.perf_counter()), whichever comes first.
+    """
+    dead = set(hole) | set(board)
+    stub = [c for c in FULL_DECK if c not in dead]
+    need = 5 - len(board) + 2 * opponents
+    won = 0.0
+    n = 0
+    while samples is None or n < samples:
+        if deadline is not None and n % 32 == 0 and time.perf_counter() >= deadline:
+            break
+        draw = rng.sample(stub, need)
+        full_board = board + draw[:5 - len(board)]
+        hero = evaluate_7(hole + full_board)
+        best, ties = True, 1
+        for i in range(opponents):
+            j = 5 - len(board) + 2 * i
+            villain = evaluate_7(draw[j:j + 2] + full_board)
+            if villain > hero:
+                best = False
+                break
+            if villain == hero:
+                ties += 1
+        if best:
+            won += 1 / ties
+        n += 1
+    return won / n if n else None
+
+def choose_action(t, p, budget=DEFAULT_DEADLINE, rng=random):
+    """
+    Pick (action, amount) for bot player `p`, finishing within `budget` seconds.
+    Preflop uses the precomputed table; later streets sample equity until the deadline.
+    Decision compares equity with the pot odds of calling.
+    """
+    deadline = time.perf_counter() + budget * 0.9
+    opponents = sum(1 for q in t.players if q is not p and not q.folded)
+    to_call = max(0, t.current_bet - p.committed)
+
+    equity = None
+    if not t.board and preflop_key(p.hole) in PREFLOP_EQUITY:
+        equity = PREFLOP_EQUITY[preflop_key(p.hole)] ** opponents  # rough multiway estimate
+    if equity is None:
+        equity = sample_equity(p.hole, t.board, opponents, samples=5000, deadline=deadline, rng=rng)
+    if equity is None:  # no time to sample at all
+        equity = 0.5 ** opponents
+
+    pot_odds = to_call / (t.pot + to_call) if to_call else 0.0
+    strong = equity > 0.5 + 0.35 * (1 - 0.5 ** opponents) if opponents > 1 else equity > 0.65
+
+    if strong and p.stack > to_call:
+        raise_by = max(t.bb, (t.pot + to_call) // 2)
+        if to_call + raise_by >= p.stack:
+            return "allin", 0
+        return "raise", raise_by
+    if to_call == 0:
+        return "check", 0
+    if equity >= pot_odds:
+        return ("call", 0) if p.stack > to_call else ("allin", 0)
+    return "fold", 0
+
+
+# ===== Discord glue =====
+class BotAuthor:
+    def __init__(self, player):
+        self.id = player.user_id
+        self.display_name = player.name
+
+
+class BotContext:
+    """Wraps the table's context so command callbacks see the bot as the author."""
+    def __init__(self, ctx, player):
+        self.author = BotAuthor(player)
+        self.bot = ctx.bot
+        self.channel = ctx.channel
+        self.guild = ctx.guild
+        self._ctx = ctx
+
+    async def send(self, *args, **kwargs):
+        return await self._ctx.send(*args, **kwargs)
+
+
+def next_bot_id(t):
+    """Bots get negative ids so they never collide with Discord user ids."""
+    return min([p.user_id for p in t.players if p.user_id < 0], default=0) - 1
+
+def schedule(ctx, t, deadline=None):
+    """
+    Let a bot act if it is on turn or owes a show/muck decision. Runs as a task so command handlers don't nest.
+    `deadline` (seconds) defaults to DEFAULT_DEADLINE, set with POKER_BOT_DEADLINE_MS.
+    """
+    tracing.spawn(ctx.bot.loop, take_turn(ctx, t, DEFAULT_DEADLINE if deadline is None else deadline))
+
+async def take_turn(ctx, t, deadline=None):
+    deadline = DEFAULT_DEADLINE if deadline is None else deadline
+    if t.showdown_pending:
+        for uid, decision in list(t.pending_show.items()):
+            bot = next((p for p in t.players if p.user_id == uid and p.is_bot), None)
+            if bot and decision is None:
+                await t.resolve_show_or_muck(BotContext(ctx, bot), uid, action="muck")
+        return
+    if t.street in ("idle", "showdown") or t.turn_idx is None:
+        return
+    p = t.players[t.turn_idx]
+    if not p.is_bot or p.folded:
+        return
+
+    hand = t.hand_count
+    loop = asyncio.get_running_loop()
+    try:
+        action, amount = await asyncio.wait_for(
+            loop.run_in_executor(None, choose_action, t, p, deadline),
+            timeout=deadline,  # the budget is a hard limit; choose_action aims for 90% of it
+        )
+    except asyncio.TimeoutError:
+        action, amount = ("check", 0) if p.committed >= t.current_bet else ("fold", 0)
+
+    # the table may have moved on while we were thinking (e.g. !poker end)
+    if t.hand_count != hand or t.players[t.turn_idx] is not p:
+        return
+    command = ctx.bot.get_command(action)
+    bctx = BotContext(ctx, p)
+    if action == "raise":
+        await command.callback(bctx, amount)
+    else:
+        await command.callback(bctx)
@@ -0,0 +1,9 @@
+import pytest
+import shuffle
+
+
+@pytest.fixture
+def seed_decks():
+    """Call with a seed to deal reproducible decks; OS entropy is restored (and filler threads stopped) afterwards."""
+    yield shuffle.use_seed
+    shuffle.use_seed(None)
@@ -74,3 +74,204 @@ def best_hand(cards7):
         if not best or score > best[0]:
             best = (score, combo, name)
     return best
+
+CATEGORY_NAMES = [
+    "High Card", "One Pair", "Two Pair", "Three of a Kind", "Straight",
+    "Flush", "Full House", "Four of a Kind", "Straight Flush",
+]
+
+def _straight_high(mask):
+    """Highest straight in a rank bitmask (bit v set for rank value v), or 0."""
+    if mask & (1 << 14):
+        mask |= 1 << 1  # ace plays low for the wheel
+    for high in range(14, 4, -1):
+        if (mask >> (high - 4)) & 0x1F == 0x1F:
+            return high
+    return 0
+
+def _tally(cards):
+    """Rank counts, per-suit rank lists and rank bitmask of `cards`."""
+    counts = [0] * 15
+    suited = ([], [], [], [])
+    mask = 0
+    for r, s in cards:
+        v = r + 2
+        counts[v] += 1
+        suited[s].append(v)
+        mask |= 1 << v
+    return counts, suited, mask
+
+def evaluate_batch(hands):
+    """
+    Score many (hole, board) pairs, e.g. every player on every runout board.
+    Consecutive pairs on the same board share one tally of its cards, and
+    only suits the board already has 5 - len(hole) of are checked for a flush.
+    """
+    scores = []
+    last = None
+    for hole, board in hands:
+        if board is not last:
+            last = board
+            board_counts, board_suited, board_mask = _tally(board)
+            need = 5 - len(hole)
+            flush_suits = [s for s in range(4) if len(board_suited[s]) >= need]
+        counts = board_counts[:]
+        mask = board_mask
+        for r, _s in hole:
+            v = r + 2
+            counts[v] += 1
+            mask |= 1 << v
+        flush_ranks = None
+        for fs in flush_suits:
+            ranks = board_suited[fs] + [r + 2 for r, s in hole if s == fs]
+            if len(ranks) >= 5:
+                flush_ranks = ranks
+                break
+        scores.append(_score(counts, mask, flush_ranks))
+    return scores
+
+def evaluate_7(cards):
+    """
+    Score the best 5-card hand in 5–7 cards without trying every combination.
+    Returns the same score tuple as best_hand(cards)[0], so the two compare directly.
+    """
+    counts, suited, mask = _tally(cards)
+    flush_ranks = next((ranks for ranks in suited if len(ranks) >= 5), None)
+    return _score(counts, mask, flush_ranks)
+
+def _score(counts, mask, flush_ranks):
+    """evaluate_7's ranking from tallied cards; `flush_ranks` holds the flush suit's ranks, if any."""
+    flush = None
+    if flush_ranks:
+        suit_mask = 0
+        for v in flush_ranks:
+            suit_mask |= 1 << v
+        high = _straight_high(suit_mask)
+        if high:
+            return (8, high)
+        flush = (5, *sorted(flush_ranks, reverse=True)[:5])
+
+    quads, trips, pairs, singles = [], [], [], []
+    for v in range(14, 1, -1):
+        c = counts[v]
+        if c == 4:
+            quads.append(v)
+        elif c == 3:
+            trips.append(v)
+        elif c == 2:
+            pairs.append(v)
+        elif c == 1:
+            singles.append(v)
+
+    if quads:
+        kicker = max(v for v in range(14, 1, -1) if counts[v] and v != quads[0])
+        return (7, quads[0], kicker)
+    if trips and (len(trips) > 1 or pairs):
+        return (6, trips[0], max(trips[1:] + pairs))
+    if flush:
+        return flush
+    high = _straight_high(mask)
+    if high:
+        return (4, high)
+    if trips:
+        return (3, trips[0], *singles[:2])
+    if len(pairs) > 1:
+        return (2, pairs[0], pairs[1], max(pairs[2:] + singles))
+    if pairs:
+        return (1, pairs[0], *singles[:3])
+    return (0, *singles[:5])
+
+class HandStrength:
+    """
+    One player's hand strength, updated street by street as board cards arrive.
+    add_board() keeps running rank counts, suit counts and rank masks, so
+    describe() reads them instead of re-evaluating every card.
+    """
+    def __init__(self, hole):
+        self.hole = list(hole)
+        self.board = []
+        self.counts = [0] * 15          # rank value -> cards held
+        self.suits = [0, 0, 0, 0]
+        self.suit_masks = [0, 0, 0, 0]  # rank mask per suit, for straight flushes
+        self.hole_suits = {s for _, s in hole}
+        self.mask = 0
+        self.hole_mask = 0
+        self.top_board = 0
+        self.bottom_board = 15
+        for r, s in hole:
+            self._add(r, s)
+            self.hole_mask |= 1 << (r + 2)
+
+    def _add(self, r, s):
+        v = r + 2
+        self.counts[v] += 1
+        self.suits[s] += 1
+        self.suit_masks[s] |= 1 << v
+        self.mask |= 1 << v
+
+    def add_board(self, cards):
+        for r, s in cards:
+            self.board.append((r, s))
+            self._add(r, s)
+            self.top_board = max(self.top_board, r + 2)
+            self.bottom_board = min(self.bottom_board, r + 2)
+
+    def category(self):
+        """Hand category (as in evaluate_5) and, for one pair, the pair's rank value."""
+        flush = next((s for s in range(4) if self.suits[s] >= 5), None)
+        if flush is not None and _straight_high(self.suit_masks[flush]):
+            return 8, None
+        pairs = [v for v in range(14, 1, -1) if self.counts[v] == 2]
+        trips = [v for v in range(14, 1, -1) if self.counts[v] == 3]
+        if any(c == 4 for c in self.counts):
+            return 7, None
+        if trips and (pairs or len(trips) > 1):
+            return 6, None
+        if flush is not None:
+            return 5, None
+        if _straight_high(self.mask):
+            return 4, None
+        if trips:
+            return 3, None
+        if len(pairs) >= 2:
+            return 2, None
+        if pairs:
+            return 1, pairs[0]
+        return 0, None
+
+    def made_hand(self):
+        category, pair = self.category()
+        pocket_pair = self.hole[0][0] == self.hole[1][0]
+        if category == 3:
+            return "Set" if pocket_pair else "Trips"
+        if category != 1:
+            return CATEGORY_NAMES[category]
+        if pocket_pair:
+            return "Overpair" if pair > self.top_board else "Pocket Pair"
+        if not self.hole_mask & (1 << pair):
+            return "Pair on Board"
+        if pair == self.top_board:
+            return "Top Pair"
+        if pair == self.bottom_board:
+            return "Bottom Pair"
+        return "Middle Pair"
+
+    def draws(self):
+        if len(self.board) >= 5:
+            return []
+        found = []
+        if any(self.suits[s] == 4 for s in self.hole_suits):
+            found.append("Flush Draw")
+        if not _straight_high(self.mask):
+            mask = self.mask | (2 if self.mask & (1 << 14) else 0)
+            open_ended = any((mask >> low) & 0xF == 0xF for low in range(2, 11))
+            gutshot = any(bin((mask >> low) & 0x1F).count("1") == 4 for low in range(1, 11))
+            if open_ended:
+                found.append("Open-Ended Straight Draw")
+            elif gutshot:
+                found.append("Gutshot")
+        return found
+
+    def describe(self):
+        """e.g. 'Top Pair + Flush Draw'."""
+        return " + ".join([self.made_hand()] + self.draws())
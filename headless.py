@@ -0,0 +1,115 @@
+"""Discord-free driver for PokerTable.
+
+Plays whole hands by asking a policy for each decision and applying it the same
+way the command handlers in pokerbot_5d.py do. Used by the tournament
+simulator, load tests and bot self-play.
+"""
+import random
+
+CHECK, CALL, RAISE, ALLIN, FOLD = "check", "call", "raise", "allin", "fold"
+
+
+def legal_actions(t, p):
+    """Actions `p` may take right now (raise means at least one chip over the call)."""
+    to_call = t.current_bet - p.committed
+    acts = [FOLD]
+    acts.append(CALL if to_call > 0 else CHECK)
+    if p.stack > to_call:
+        acts.append(RAISE)
+    if p.stack - to_call <= t.max_raise(p):  # pot limit can rule out shoving
+        acts.append(ALLIN)
+    return acts
+
+
+def apply_action(t, p, action, amount=0):
+    """Mutate table state for one action, mirroring the !poker command handlers."""
+    if action == CHECK:
+        if p.committed < t.current_bet:
+            raise ValueError("cannot check facing a bet")
+    elif action == CALL:
+        pay = min(t.current_bet - p.committed, p.stack)
+        p.stack -= pay
+        p.committed += pay
+        t.pot += pay
+    elif action == RAISE:
+        total = t.current_bet - p.committed + amount
+        if amount < 1 or amount > t.max_raise(p):
+            raise ValueError("invalid raise amount")
+        p.stack -= total
+        p.committed += total
+        t.pot += total
+        t.current_bet += amount
+    elif action == ALLIN:
+        pay = p.stack
+        p.stack = 0
+        p.committed += pay
+        t.pot += pay
+        t.current_bet = max([q.committed for q in t.players if not q.folded] + [t.current_bet])
+    elif action == FOLD:
+        p.folded = True
+    else:
+        raise ValueError(f"unknown action {action!r}")
+    t.acted_this_round.add(p.user_id)
+
+
+def settle_showdown(t):
+    """Run out any remaining board, pay every pot and return the players who won chips."""
+    while t.street != "showdown":
+        t.next_street()
+    pots = t.award_showdown()
+    t.street = "idle"
+    players = []
+    for _, winners, _ in pots:
+        players += [p for p in winners if p not in players]
+    return players
+
+
+def play_hand(t, policy, max_actions=500):
+    """
+    Play one full hand on `t`. `policy(t, p)` returns (action, amount).
+    Returns the list of players who won chips, or None if no hand could start.
+    """
+    ok, _ = t.begin_hand()
+    if not ok:
+        return None
+
+    for _ in range(max_actions):
+        alive = [p for p in t.players if not p.folded]
+        if len(alive) == 1:
+            t.award_pot(alive)
+            t.street = "idle"
+            return alive
+        if any(p.stack == 0 for p in alive) and t.everyone_matched():
+            return settle_showdown(t)
+        if t.everyone_matched():
+            t.next_street()
+            if t.street == "showdown":
+                return settle_showdown(t)
+            t.turn_idx -= 1
+            t.advance_turn()
+            continue
+
+        p = t.players[t.turn_idx]
+        if p.folded or p.stack == 0:
+            t.advance_turn()
+            continue
+        action, amount = policy(t, p)
+        apply_action(t, p, action, amount)
+        t.advance_turn()
+
+    raise RuntimeError(f"hand #{t.hand_count} did not finish in {max_actions} actions")
+
+
+def random_policy(rng=random, fold=0.25, allin=0.1, raise_=0.15):
+    """Build a cheap random policy, handy for load tests that just need chips to move."""
+    def decide(t, p):
+        acts = legal_actions(t, p)
+        roll = rng.random()
+        if roll < fold and CALL in acts:
+            return FOLD, 0
+        if roll < fold + allin and ALLIN in acts:
+            return ALLIN, 0
+        if roll < fold + allin + raise_ and RAISE in acts:
+            return RAISE, rng.randint(1, max(1, min(t.pot, t.max_raise(p))))
+        return (CALL if CALL in acts else CHECK), 0
+    return decide
@@ -0,0 +1,43 @@
+import json
+import os
+import uuid
+
+HISTORY_PATH = os.getenv("POKER_HISTORY", "hand_history.jsonl")
+
+
+def hand_record(t):
+    """Summary of the hand that just finished on table `t`, ready to append to the history file."""
+    return {
+        "id": uuid.uuid4().hex,
+        "channel": t.channel_id,
+        "hand": t.hand_count,
+        "variant": t.variant.key,
+        "seed": t.seed.hex(),
+        "commitment": t.seed_commitment,
+        "board": t.board,
+        "players": [
+            {"id": p.user_id, "name": p.name, "hole": p.hole, "net": p.stack - p.start_stack}
+            for p in t.players if p.hole
+        ],
+        "allin": t.allin_snapshot,
+    }
+
+def append_hand(record, path=None):
+    with open(path or HISTORY_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+def iter_hands(path=None, offset=0):
+    """
+    Lazily yield (next_offset, record) from the history file starting at byte `offset`,
+    so callers can remember where they stopped and only read new hands next time.
+    """
+    path = path or HISTORY_PATH
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            offset += len(line)
+            if not line.endswith(b"\n"):
+                break  # partially written line; pick it up next time
+            yield offset, json.loads(line)
@@ -0,0 +1,336 @@
+"""
+Load test against a local Discord stand-in.
+
+Runs the real command handlers from pokerbot_5d.py and the real ActionView
+buttons on N tables at once. Scripted players click buttons through
+InteractionContext. Every channel send, DM, message edit and interaction
+response goes through a fake API that adds latency and random 429s (retried
+after `retry_after`, like discord.py's HTTP client).
+
+Text commands (start, join, buyin, begin, run, muck) are invoked by calling
+each Command's callback with already-converted arguments and a FakeContext,
+the same way the ActionView buttons call them. So argument parsing and
+conversion, command checks, error handlers and TracedContext's "send" spans
+are not exercised, and the numbers leave out discord.py's own dispatch
+overhead for typed commands. Button clicks do go through the real path.
+
+    python loadtest.py --tables 200 --hands 5
+    python loadtest.py --sweep 50,100,200,400 --hands 3
+
+A sweep stops at the first table count whose loop-lag p99 or action→response
+p99 crosses --lag-threshold / --ack-threshold and reports it as the
+saturation point.
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import logging
+import os
+import random
+import resource
+import tempfile
+import time
+from collections import Counter
+
+import history
+import showdown
+import shuffle
+import tracing
+from headless import legal_actions
+from ui import ActionView
+
+import pokerbot_5d
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+# ===== Discord stand-in =====
+class FakeAPI:
+    """Shared 'HTTP' layer: every call waits a random latency and may be rate limited."""
+    def __init__(self, latency=0.05, jitter=0.03, rate_limit=0.01, retry_after=0.5, rng=random):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.rng = rng
+        self.calls = Counter()
+        self.rate_limited = 0
+
+    async def call(self, route):
+        while True:
+            self.calls[route] += 1
+            await asyncio.sleep(max(0.0, self.rng.gauss(self.latency, self.jitter)))
+            if self.rng.random() >= self.rate_limit:
+                return
+            self.rate_limited += 1
+            await asyncio.sleep(self.retry_after)
+
+
+class FakeMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, api, channel, content, view):
+        self.id = next(self._ids)
+        self.api = api
+        self.channel = channel
+        self.content = content
+        self.view = view
+
+    async def edit(self, **kwargs):
+        await self.api.call("message.edit")
+        self.view = kwargs.get("view", self.view)
+
+
+class FakeChannel:
+    def __init__(self, channel_id, api):
+        self.id = channel_id
+        self.api = api
+        self.last_view_message = None
+        self.last_content = None
+        self.new_message = asyncio.Event()
+
+    async def send(self, content=None, **kwargs):
+        await self.api.call("send")
+        msg = FakeMessage(self.api, self, content, kwargs.get("view"))
+        if msg.view is not None:
+            self.last_view_message = msg
+        self.last_content = content
+        self.new_message.set()
+        return msg
+
+
+class FakeMember:
+    def __init__(self, user_id, api):
+        self.id = user_id
+        self.display_name = f"user{user_id}"
+        self.api = api
+
+    async def send(self, *args, **kwargs):
+        await self.api.call("dm")
+
+
+class FakeGuild:
+    def __init__(self, members):
+        self.members = {m.id: m for m in members}
+
+    def get_member(self, user_id):
+        return self.members.get(user_id)
+
+
+class FakeResponse:
+    def __init__(self, api):
+        self.api = api
+
+    async def send_message(self, *args, **kwargs):
+        await self.api.call("interaction.response")
+
+
+class FakeInteraction:
+    def __init__(self, user, channel, guild, message, client, api):
+        self.user = user
+        self.channel = channel
+        self.guild = guild
+        self.message = message
+        self.client = client
+        self.response = FakeResponse(api)
+
+
+class FakeContext:
+    """Text-command context: what commands.Context gives the handlers."""
+    def __init__(self, author, channel, guild, bot):
+        self.author = author
+        self.channel = channel
+        self.guild = guild
+        self.bot = bot
+
+    async def send(self, *args, **kwargs):
+        with tracing.span("send"):
+            return await self.channel.send(*args, **kwargs)
+
+    async def reply(self, *args, **kwargs):
+        return await self.channel.send(*args, **kwargs)
+
+
+# ===== Scripted table =====
+BUTTONS = {"check": "check_btn", "call": "call_btn", "raise": "pot_half_btn", "allin": "allin_btn", "fold": "fold_btn"}
+
+async def command(name, ctx, *args):
+    """Run a text command's handler directly (no parsing, checks or error handlers; see the module docstring)."""
+    await pokerbot_5d.bot.get_command(name).callback(ctx, *args)
+
+async def play_table(channel_id, api, hands, stats, rng):
+    bot = pokerbot_5d.bot
+    channel = FakeChannel(channel_id, api)
+    members = [FakeMember(channel_id * 10 + i, api) for i in (1, 2)]
+    guild = FakeGuild(members)
+    ctxs = {m.id: FakeContext(m, channel, guild, bot) for m in members}
+
+    first = ctxs[members[0].id]
+    await command("start", first, 5, 10, 500, 1000)
+    for m in members:
+        await command("join", ctxs[m.id])
+        await command("buyin", ctxs[m.id], 1000)
+    await command("begin", first)
+    t = pokerbot_5d.tables[channel_id]
+
+    acted_on = set()
+    pending = []
+    while True:
+        channel.new_message.clear()
+        if t.runout_pending:
+            for p in t.players:
+                if p.user_id not in t.runout_votes:
+                    await command("run", ctxs[p.user_id], rng.choice([1, 1, 2]))
+        elif t.showdown_pending:
+            for uid, decision in list(t.pending_show.items()):
+                if decision is None:
+                    await command("muck", ctxs[uid])
+        elif t.hand_count > hands:
+            break
+        else:
+            msg = channel.last_view_message
+            view = msg.view if msg else None
+            if isinstance(view, ActionView) and msg.id not in acted_on and not view.children[0].disabled:
+                acted_on.add(msg.id)
+                p = t.players[t.turn_idx]
+                action = rng.choice(legal_actions(t, p))
+                if action == "raise" and (t.current_bet - p.committed) + max(1, t.pot // 2) > p.stack:
+                    action = "allin"
+                member = guild.get_member(p.user_id)
+                interaction = FakeInteraction(member, channel, guild, msg, bot, api)
+                start = time.perf_counter()
+                # the callback may sit in a vote/show window, so let it run while we keep playing
+                pending.append(asyncio.create_task(getattr(view, BUTTONS[action]).callback(interaction)))
+                # first new message after the click = the player sees their action land
+                try:
+                    await asyncio.wait_for(channel.new_message.wait(), timeout=10)
+                    stats["ack"].append(time.perf_counter() - start)
+                except asyncio.TimeoutError:
+                    stats["timeouts"] += 1
+                stats["actions"] += 1
+                continue
+            if (channel.last_content or "").startswith("⏸"):  # finish_hand stopped: someone is broke
+                for p in t.players:  # rebuy so the table keeps going
+                    if p.stack == 0:
+                        p.stack = 1000
+                await command("begin", first)
+                continue
+        try:
+            await asyncio.wait_for(channel.new_message.wait(), timeout=1)
+        except asyncio.TimeoutError:
+            pass
+    stats["hands"] += hands
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def lag_monitor(samples, interval=0.05):
+    """Event-loop lag: how late a sleep wakes up. Grows once the process saturates."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - start - interval)
+
+
+async def run(tables, hands, api, seed=None):
+    pokerbot_5d.bot.loop = asyncio.get_running_loop()
+    pokerbot_5d.tables.clear()
+    rng = random.Random(seed)
+    if seed is not None:
+        shuffle.use_seed(seed)  # same decks every run
+    stats = {"ack": [], "actions": 0, "hands": 0, "timeouts": 0}
+    lag = []
+    monitor = asyncio.create_task(lag_monitor(lag))
+
+    gc.collect()
+    mem_before = rss_mb()
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(play_table(cid, api, hands, stats, rng) for cid in range(1, tables + 1)))
+    finally:
+        if seed is not None:
+            shuffle.use_seed(None)
+    elapsed = time.perf_counter() - start
+    monitor.cancel()
+    gc.collect()
+    stats.update(elapsed=elapsed, lag=lag, mem_before=mem_before, mem_after=rss_mb())
+    return stats
+
+
+def report(tables, stats, api):
+    total_calls = sum(api.calls.values())
+    print(f"tables={tables} hands={stats['hands']} actions={stats['actions']} in {stats['elapsed']:.1f}s"
+          f" (no response: {stats['timeouts']})")
+    print(f"  action→response p50 {percentile(stats['ack'], 50) * 1000:.0f}ms "
+          f"p99 {percentile(stats['ack'], 99) * 1000:.0f}ms | "
+          f"loop lag p99 {percentile(stats['lag'], 99) * 1000:.0f}ms")
+    print(f"  API calls/hand {total_calls / max(1, stats['hands']):.1f} "
+          f"({', '.join(f'{k} {v}' for k, v in api.calls.most_common())}) | 429s {api.rate_limited}")
+    print(f"  memory {stats['mem_before']:.0f}MB → {stats['mem_after']:.0f}MB")
+
+
+def saturation(stats, lag_threshold, ack_threshold):
+    """Why this run counts as saturated (thresholds in seconds), or None."""
+    lag, ack = percentile(stats["lag"], 99), percentile(stats["ack"], 99)
+    if lag >= lag_threshold:
+        return f"loop lag p99 {lag * 1000:.0f}ms >= {lag_threshold * 1000:.0f}ms"
+    if ack >= ack_threshold:
+        return f"action→response p99 {ack * 1000:.0f}ms >= {ack_threshold * 1000:.0f}ms"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--sweep", type=str, default=None, help="comma-separated table counts")
+    parser.add_argument("--hands", type=int, default=5, help="hands per table")
+    parser.add_argument("--latency", type=float, default=0.05, help="mean API latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.03)
+    parser.add_argument("--rate-limit", type=float, default=0.01, help="probability a call gets a 429")
+    parser.add_argument("--retry-after", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--show-slow", action="store_true", help="print slow-action traces")
+    parser.add_argument("--lag-threshold", type=float, default=100, help="sweep: loop-lag p99 (ms) that counts as saturated")
+    parser.add_argument("--ack-threshold", type=float, default=1000,
+                        help="sweep: action→response p99 (ms) that counts as saturated")
+    args = parser.parse_args()
+
+    if not args.show_slow:
+        logging.getLogger("pokerbot.trace").setLevel(logging.ERROR)
+
+    # compress the human-paced pauses; they are not what we're measuring
+    showdown.NEXT_HAND_DELAY = 0.05
+    showdown.SHOW_WINDOW_SECONDS = 0.5
+    showdown.RUNOUT_VOTE_SECONDS = 0.5
+    history.HISTORY_PATH = os.path.join(tempfile.mkdtemp(), "hand_history.jsonl")
+
+    counts = sorted(int(n) for n in args.sweep.split(",")) if args.sweep else [args.tables]
+    for n in counts:
+        api = FakeAPI(args.latency, args.jitter, args.rate_limit, args.retry_after, random.Random(args.seed))
+        stats = asyncio.run(run(n, args.hands, api, args.seed))
+        report(n, stats, api)
+        if args.sweep:
+            reason = saturation(stats, args.lag_threshold / 1000, args.ack_threshold / 1000)
+            if reason:
+                print(f"saturated at {n} tables: {reason}")
+                return
+    if args.sweep:
+        print(f"no saturation up to {counts[-1]} tables")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+All-in adjusted EV ("luck") over the hand history.
+
+For every hand that went to showdown with a player all-in, each live player's
+expected winnings are the sum over the main and side pots of their equity in
+that pot (against only the players eligible for it) times its amount, minus
+what they invested at the moment of the all-in. Luck is actual winnings minus
+that EV.
+"""
+import json
+import os
+import random
+import tempfile
+import threading
+from itertools import combinations
+from math import comb
+from history import iter_hands
+from variants import HOLDEM, VARIANTS
+
+CACHE_PATH = os.getenv("POKER_LUCK_CACHE", "luck_cache.json")
+EXACT_LIMIT = 2000   # enumerate every runout when there are at most this many
+SAMPLES = 10000      # otherwise (e.g. preflop all-ins) sample this many
+BATCH_SIZE = 500     # hands read per batch
+
+_update_lock = threading.Lock()  # concurrent !poker luck calls each run update() in the executor
+
+
+def canonical(holes, board):
+    """Relabel suits in order of first appearance; equity is the same for every suit relabelling."""
+    suit_map = {}
+    def card(c):
+        return (c[0], suit_map.setdefault(c[1], len(suit_map)))
+    holes = tuple(tuple(card(c) for c in h) for h in holes)
+    board = tuple(card(c) for c in board)
+    return holes, board
+
+def runout_equity(holes, board, variant=HOLDEM):
+    """Share of the pot each hand wins over all remaining boards (exact, or seeded sampling if too many)."""
+    return pot_equities(holes, board, [range(len(holes))], variant)[0]
+
+def pot_equities(holes, board, pots, variant=HOLDEM):
+    """
+    Like runout_equity, once per pot: `pots` lists the indices of the hands
+    eligible for each pot, and each pot's shares are decided among those hands
+    only (0 for the rest). Every hand's cards stay out of the runouts.
+    """
+    holes = [list(h) for h in holes]
+    board = list(board)
+    dead = {c for h in holes for c in h} | set(board)
+    stub = [c for c in variant.deck() if c not in dead]
+    k = 5 - len(board)
+    if comb(len(stub), k) <= EXACT_LIMIT:
+        boards = [board + list(extra) for extra in combinations(stub, k)]
+    else:
+        rng = random.Random(repr((holes, board)))  # same spot, same estimate
+        boards = [board + rng.sample(stub, k) for _ in range(SAMPLES)]
+
+    n = len(holes)
+    scores = variant.evaluate_batch([(h, b) for b in boards for h in holes])
+    shares = [[0.0] * n for _ in pots]
+    for i in range(len(boards)):
+        run = scores[i * n:(i + 1) * n]
+        for eligible, pot_shares in zip(pots, shares):
+            best = max(run[j] for j in eligible)
+            winners = [j for j in eligible if run[j] == best]
+            for j in winners:
+                pot_shares[j] += 1 / len(winners)
+    return [[s / len(boards) for s in pot_shares] for pot_shares in shares]
+
+
+def load_cache(path=None):
+    path = path or CACHE_PATH
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"offset": 0, "hands": {}, "names": {}}
+
+def save_cache(cache, path=None):
+    path = os.fspath(path or CACHE_PATH)
+    # unique temp file next to the cache, so concurrent writers never share one
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(path) or ".",
+                                     prefix=os.path.basename(path), suffix=".tmp", delete=False) as f:
+        json.dump(cache, f, separators=(",", ":"))
+    os.replace(f.name, path)
+
+def _process_batch(batch, cache):
+    """Evaluate each distinct all-in situation in the batch once, then store per-hand EV."""
+    def pots(snap):
+        # hands recorded before side pots were snapshotted: one pot everyone live can win
+        return snap.get("pots") or [{"amount": snap["pot"], "eligible": [p["id"] for p in snap["players"]]}]
+
+    def spot(rec):
+        snap = rec["allin"]
+        ids = [p["id"] for p in snap["players"]]
+        eligible = tuple(tuple(ids.index(uid) for uid in pot["eligible"]) for pot in pots(snap))
+        return (rec.get("variant", HOLDEM.key), *canonical([p["hole"] for p in snap["players"]], snap["board"]),
+                eligible)
+
+    spots = dict.fromkeys(spot(rec) for rec in batch)
+    for key in spots:
+        game, holes, board, eligible = key
+        spots[key] = pot_equities(holes, board, eligible, VARIANTS[game])
+
+    for rec in batch:
+        snap = rec["allin"]
+        live = snap["players"]
+        equities = spots[spot(rec)]
+        amounts = [pot["amount"] for pot in pots(snap)]
+        net = {p["id"]: p["net"] for p in rec["players"]}
+        entry = {}
+        for i, p in enumerate(live):
+            ev = sum(amount * shares[i] for amount, shares in zip(amounts, equities)) - p["invested"]
+            entry[str(p["id"])] = [net.get(p["id"], 0), ev]
+        cache["hands"][rec["id"]] = entry
+        for p in rec["players"]:
+            cache["names"][str(p["id"])] = p["name"]
+
+def update(history_path=None, cache_path=None):
+    """Stream hands added since the last run, compute their all-in EV and persist the cache."""
+    with _update_lock:  # one read-modify-write at a time, so a stale snapshot can't overwrite a newer one
+        return _update(history_path, cache_path)
+
+def _update(history_path, cache_path):
+    cache = load_cache(cache_path)
+    batch = []
+    for offset, rec in iter_hands(history_path, cache["offset"]):
+        if rec.get("allin") and rec["id"] not in cache["hands"]:
+            batch.append(rec)
+        if len(batch) >= BATCH_SIZE:
+            _process_batch(batch, cache)
+            batch = []
+        cache["offset"] = offset
+    if batch:
+        _process_batch(batch, cache)
+    save_cache(cache, cache_path)
+    return cache
+
+def report(cache):
+    """Per-player totals over all cached all-in hands: {user_id: (name, hands, actual, ev)}."""
+    totals = {}
+    for entry in cache["hands"].values():
+        for uid, (actual, ev) in entry.items():
+            name, hands, a, e = totals.get(uid, (cache["names"].get(uid, uid), 0, 0, 0.0))
+            totals[uid] = (name, hands + 1, a + actual, e + ev)
+    return {int(uid): row for uid, row in totals.items()}
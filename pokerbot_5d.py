@@ -1,4 +1,5 @@
 import os
+import io
 import asyncio
 import discord
 from discord.ext import commands
@@ -6,18 +7,33 @@ import webserver
 
 from ui import ActionView
 from table import PokerTable
-from utils import code_to_url, card_code, send_board_images
-from showdown import handle_allin_runout, begin_showdown, finish_hand
+from variants import HOLDEM, VARIANTS
+from utils import code_to_url, card_code, send_board_images, dm_hand_strength
+from showdown import handle_allin_runout, begin_showdown, finish_hand, MAX_RUNOUTS
+import bot_player
+import luck
+import tracing
 
-webserver.keep_alive()
 TOKEN = os.getenv("DISCORD_BOT_TOKEN")
-if not TOKEN:
-    raise SystemExit("Set DISCORD_BOT_TOKEN env var before running.")
 
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
-bot = commands.Bot(command_prefix="!poker ", intents=intents)
+
+
+class TracedContext(commands.Context):
+    """Context whose sends show up as stages of the current action trace."""
+    async def send(self, *args, **kwargs):
+        with tracing.span("send"):
+            return await super().send(*args, **kwargs)
+
+
+class PokerBot(commands.Bot):
+    async def get_context(self, origin, /, *, cls=TracedContext):
+        return await super().get_context(origin, cls=cls)
+
+
+bot = PokerBot(command_prefix="!poker ", intents=intents)
 
 # remove default help so we can override with custom
 bot.remove_command("help")
@@ -32,8 +48,9 @@ def get_table(ctx) -> PokerTable | None:
 async def help_cmd(ctx):
     help_text = """
 **Setup**
-- `!poker start <sb> <bb> <min_buyin> <max_buyin>` → Create a new table in this channel
+- `!poker start <sb> <bb> <min_buyin> <max_buyin> [holdem|plo|shortdeck]` → Create a new table in this channel
 - `!poker join` → Sit down at the table
+- `!poker addbot` → Seat a computer opponent (buys in for the max)
 - `!poker buyin <amount>` → Buy in with chips (within min/max)
 - `!poker begin` → Start a new hand (also auto-continues after each hand)
 - `!poker status` → Show the current table state
@@ -46,6 +63,12 @@ async def help_cmd(ctx):
 - `!poker allin` → Push all your chips in
 - `!poker fold` → Fold your hand
 
+**All-in**
+- `!poker run <2|3>` → Agree to run the board out multiple times (everyone must agree)
+
+**Stats**
+- `!poker luck [@user]` → Actual winnings vs all-in equity (EV) over recorded all-in hands
+
 **Showdown & Muck**
 - `!poker show` → Reveal your cards (after losing or winning by fold)
 - `!poker muck` → Muck your cards (default after 7s if no action)
@@ -55,12 +78,15 @@ async def help_cmd(ctx):
 
 
 @bot.command(name="start")
-async def start(ctx, sb: int, bb: int, min_buyin: int, max_buyin: int):
+async def start(ctx, sb: int, bb: int, min_buyin: int, max_buyin: int, game: str = "holdem"):
     if get_table(ctx):
         return await ctx.reply("Table already exists here.")
-    t = PokerTable(ctx.channel.id, sb, bb, min_buyin, max_buyin)
+    variant = VARIANTS.get(game.lower())
+    if not variant:
+        return await ctx.reply(f"Unknown game. Choose one of: {', '.join(VARIANTS)}.")
+    t = PokerTable(ctx.channel.id, sb, bb, min_buyin, max_buyin, variant)
     tables[ctx.channel.id] = t
-    await ctx.send(f"Table created. Blinds {sb}/{bb}, buy-in {min_buyin}-{max_buyin}.")
+    await ctx.send(f"{variant.name} table created. Blinds {sb}/{bb}, buy-in {min_buyin}-{max_buyin}.")
 
 @bot.command(name="join")
 async def join(ctx):
@@ -70,6 +96,18 @@ async def join(ctx):
     ok = t.add_player(ctx.author.id, ctx.author.display_name)
     await ctx.send(f"{ctx.author.display_name} joined." if ok else "Already seated.")
 
+@bot.command(name="addbot")
+async def addbot(ctx):
+    t = get_table(ctx)
+    if not t:
+        return await ctx.reply("No table.")
+    if t.variant is not HOLDEM:
+        return await ctx.reply("The computer opponent only plays Texas Hold'em.")
+    bot_id = bot_player.next_bot_id(t)
+    t.add_player(bot_id, bot_player.BOT_NAME, is_bot=True)
+    ok, msg = t.set_buyin(bot_id, t.max_buyin)
+    await ctx.send(msg)
+
 @bot.command(name="buyin")
 async def buyin(ctx, amount: int):
     t = get_table(ctx)
@@ -79,6 +117,7 @@ async def buyin(ctx, amount: int):
     await ctx.send(msg)
 
 @bot.command(name="begin")
+@tracing.traced("begin")
 async def begin(ctx):
     t = get_table(ctx)
     if not t: return await ctx.reply("No table.")
@@ -87,18 +126,23 @@ async def begin(ctx):
 
     # DM hole cards
     for p in t.players:
+        if p.is_bot:
+            continue
         member = ctx.guild.get_member(p.user_id)
         try:
             for card in p.hole:
-                await member.send(embed=discord.Embed().set_image(url=code_to_url(card_code(*card))))
+                with tracing.span("dm"):
+                    await member.send(embed=discord.Embed().set_image(url=code_to_url(card_code(*card))))
         except Exception:
             await ctx.send(f"⚠️ Could not DM {p.name}. Enable DMs from server members.")
 
     # Send buttons for first hand
     view = ActionView(bot, t, ctx)
     await ctx.send("🟡 " + msg + "\n" + t.table_text(), view=view)
+    bot_player.schedule(ctx, t)
 
 @bot.command(name="status")
+@tracing.traced("status")
 async def status(ctx):
     t = get_table(ctx)
     if not t: return await ctx.reply("No table.")
@@ -106,7 +150,8 @@ async def status(ctx):
     await ctx.send(t.table_text(), view=view)
 
 async def maybe_next_street(ctx, t: PokerTable):
-    if t.everyone_matched():
+    new_street = t.everyone_matched()
+    if new_street:
         t.next_street()
         if t.street == "flop":
             await ctx.send("🃏 Flop:")
@@ -123,28 +168,38 @@ async def maybe_next_street(ctx, t: PokerTable):
 
     view = ActionView(bot, t, ctx)
     await ctx.send(t.table_text(), view=view)
+    bot_player.schedule(ctx, t)
+    if new_street:
+        await dm_hand_strength(ctx, t)  # after the buttons, so hints never delay the next action
 
 @bot.command(name="check")
+@tracing.traced("check")
 async def check(ctx):
     t = get_table(ctx)
     if not t: return
+    if t.runout_in_progress: return await ctx.send("⏳ The board is being run out.")
     p = t.players[t.turn_idx]
     if p.user_id != ctx.author.id: return await ctx.send("Not your turn.")
     if p.committed < t.current_bet: return await ctx.send("You cannot check; you must call or fold.")
+    tracing.mark("validate")
 
     t.acted_this_round.add(p.user_id)
     t.turn_idx = (t.turn_idx + 1) % len(t.players)
+    tracing.mark("mutate")
 
     await ctx.send(f"{p.name} checks.")
     if await handle_allin_runout(ctx, t): return
     await maybe_next_street(ctx, t)
 
 @bot.command(name="call")
+@tracing.traced("call")
 async def call(ctx):
     t = get_table(ctx)
     if not t: return
+    if t.runout_in_progress: return await ctx.send("⏳ The board is being run out.")
     p = t.players[t.turn_idx]
     if p.user_id != ctx.author.id: return await ctx.send("Not your turn.")
+    tracing.mark("validate")
 
     to_call = t.current_bet - p.committed
     pay = min(to_call, p.stack)
@@ -154,21 +209,26 @@ async def call(ctx):
 
     t.acted_this_round.add(p.user_id)
     t.turn_idx = (t.turn_idx + 1) % len(t.players)
+    tracing.mark("mutate")
 
     await ctx.send(f"{p.name} calls {pay}.")
     if await handle_allin_runout(ctx, t): return
     await maybe_next_street(ctx, t)
 
 @bot.command(name="raise")
+@tracing.traced("raise")
 async def raise_cmd(ctx, amount: int):
     t = get_table(ctx)
     if not t: return
+    if t.runout_in_progress: return await ctx.send("⏳ The board is being run out.")
     p = t.players[t.turn_idx]
     if p.user_id != ctx.author.id: return await ctx.send("Not your turn.")
 
     to_call = t.current_bet - p.committed
     total = to_call + amount
     if total > p.stack: return await ctx.send("Not enough chips.")
+    if amount > t.max_raise(p): return await ctx.send(f"Pot limit: you can raise at most {t.max_raise(p)}.")
+    tracing.mark("validate")
 
     p.stack -= total
     p.committed += total
@@ -177,17 +237,24 @@ async def raise_cmd(ctx, amount: int):
 
     t.acted_this_round.add(p.user_id)
     t.turn_idx = (t.turn_idx + 1) % len(t.players)
+    tracing.mark("mutate")
 
     await ctx.send(f"{p.name} raises {amount}. Current bet = {t.current_bet}")
+    if await handle_allin_runout(ctx, t): return
     await maybe_next_street(ctx, t)
 
 @bot.command(name="allin")
+@tracing.traced("allin")
 async def allin(ctx):
     t = get_table(ctx)
     if not t: return
+    if t.runout_in_progress: return await ctx.send("⏳ The board is being run out.")
     p = t.players[t.turn_idx]
     if p.user_id != ctx.author.id: return await ctx.send("Not your turn.")
     if p.stack <= 0: return await ctx.send("You have no chips.")
+    if p.stack - (t.current_bet - p.committed) > t.max_raise(p):
+        return await ctx.send(f"Pot limit: you can raise at most {t.max_raise(p)}.")
+    tracing.mark("validate")
 
     pay = p.stack
     p.stack = 0
@@ -197,17 +264,21 @@ async def allin(ctx):
 
     t.acted_this_round.add(p.user_id)
     t.turn_idx = (t.turn_idx + 1) % len(t.players)
+    tracing.mark("mutate")
 
     await ctx.send(f"{p.name} goes all-in for {pay}!")
     if await handle_allin_runout(ctx, t): return
     await maybe_next_street(ctx, t)
 
 @bot.command(name="fold")
+@tracing.traced("fold")
 async def fold(ctx):
     t = get_table(ctx)
     if not t: return
+    if t.runout_in_progress: return await ctx.send("⏳ The board is being run out.")
     p = t.players[t.turn_idx]
     if p.user_id != ctx.author.id: return await ctx.send("Not your turn.")
+    tracing.mark("validate")
 
     p.folded = True
     t.acted_this_round.add(p.user_id)
@@ -218,16 +289,31 @@ async def fold(ctx):
         winner.stack += t.pot
         t.pot = 0
         t.street = "idle"
+        tracing.mark("mutate")
 
         await ctx.send(f"{p.name} folds. {winner.name} wins the pot!")
         t.start_fold_winner_window(winner.user_id)
         await ctx.send(f"{winner.name}, type `!poker show` within 7s to reveal or do nothing to muck.")
+        bot_player.schedule(ctx, t)
     else:
         t.turn_idx = (t.turn_idx + 1) % len(t.players)
+        tracing.mark("mutate")
         await ctx.send(f"{p.name} folds.")
         await maybe_next_street(ctx, t)
 
+@bot.command(name="run")
+@tracing.traced("run")
+async def run_cmd(ctx, times: int):
+    t = get_table(ctx)
+    if not t or not t.runout_pending: return
+    if not any(p.user_id == ctx.author.id and not p.folded for p in t.players): return
+    if times < 1 or times > MAX_RUNOUTS:
+        return await ctx.send(f"Choose between 1 and {MAX_RUNOUTS} runouts.")
+    t.runout_votes[ctx.author.id] = times
+    await ctx.send(f"{ctx.author.display_name} agrees to run it {times} time{'s' if times > 1 else ''}.")
+
 @bot.command(name="show")
+@tracing.traced("show")
 async def show(ctx):
     t = get_table(ctx)
     if not t or not t.showdown_pending: return
@@ -235,12 +321,57 @@ async def show(ctx):
     await t.resolve_show_or_muck(ctx, ctx.author.id, action="show")
 
 @bot.command(name="muck")
+@tracing.traced("muck")
 async def muck(ctx):
     t = get_table(ctx)
     if not t or not t.showdown_pending: return
     if ctx.author.id not in t.pending_show: return
     await t.resolve_show_or_muck(ctx, ctx.author.id, action="muck")
 
+@bot.command(name="luck")
+async def luck_cmd(ctx, member: discord.Member = None):
+    # streaming/evaluation can take a while on a big history; keep the event loop free
+    cache = await asyncio.get_running_loop().run_in_executor(None, luck.update)
+    rows = luck.report(cache)
+    if member:
+        if member.id not in rows:
+            return await ctx.send(f"No all-in hands recorded for {member.display_name}.")
+        rows = {member.id: rows[member.id]}
+    if not rows:
+        return await ctx.send("No all-in hands recorded yet.")
+
+    lines = ["**🍀 All-in luck (actual − all-in EV):**"]
+    ranked = sorted(rows.values(), key=lambda r: r[2] - r[3], reverse=True)
+    for name, hands, actual, ev in ranked[:15]:
+        lines.append(f"• {name}: {hands} hands | actual {actual:+d} | EV {ev:+.0f} | luck {actual - ev:+.0f}")
+    await ctx.send("\n".join(lines))
+
+@bot.command(name="profile")
+@commands.has_permissions(administrator=True)
+async def profile(ctx, seconds: int = 30):
+    """Admin only: sample all threads for N seconds and upload a folded-stack (flamegraph) file."""
+    seconds = max(1, min(seconds, 300))
+    await ctx.send(f"🔬 Profiling for {seconds}s...")
+    prof = tracing.SamplingProfiler()
+    prof.start()
+    await asyncio.sleep(seconds)
+    prof.stop()
+    data = io.BytesIO(prof.folded().encode())
+    await ctx.send(
+        f"Profile done: {sum(prof.samples.values())} stack samples. "
+        "Open with speedscope.app or `flamegraph.pl profile.folded > profile.svg`.",
+        file=discord.File(data, filename="profile.folded"),
+    )
+
+@profile.error
+async def profile_error(ctx, error):
+    if isinstance(error, commands.MissingPermissions):
+        await ctx.reply("Only server admins can run the profiler.")
+    elif isinstance(error, commands.UserInputError):
+        await ctx.reply("Usage: `!poker profile [seconds]` (1-300).")
+    else:
+        raise error  # don't swallow real failures just because this command has a handler
+
 @bot.command(name="end")
 async def end(ctx):
     if ctx.channel.id in tables:
@@ -250,6 +381,9 @@ async def end(ctx):
         await ctx.send("No table.")
 
 if __name__ == "__main__":
+    if not TOKEN:
+        raise SystemExit("Set DISCORD_BOT_TOKEN env var before running.")
+    webserver.keep_alive()
     print("Poker bot with refreshed buttons online.")
     bot.run(TOKEN)
 
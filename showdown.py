@@ -1,17 +1,32 @@
 import asyncio
 import discord
-from hand_evaluator import best_hand, card_str
-from utils import send_board_images, code_to_url, card_code
+from hand_evaluator import card_str
+from utils import send_board_images, code_to_url, card_code, board_embeds
 from ui import ActionView
+import bot_player
+import history
+import tracing
+
+NEXT_HAND_DELAY = 3       # pause before auto-dealing the next hand
+SHOW_WINDOW_SECONDS = 7   # losers' show/muck window
+RUNOUT_VOTE_SECONDS = 7
+MAX_RUNOUTS = 3
+
+
+def pot_label(i):
+    return "Main pot" if i == 0 else f"Side pot {i}"
 
 
 async def finish_hand(ctx, t):
     """Finish/clean the hand, then auto-begin next hand after 3s if both have chips."""
+    with tracing.span("history"):
+        history.append_hand(history.hand_record(t))
     t.showdown_pending = False
     t.pending_show = {}
     t.pending_type = None
     await ctx.send(f"✅ Hand #{t.hand_count} complete.")
-    await asyncio.sleep(3)
+    with tracing.span("wait:next_hand"):
+        await asyncio.sleep(NEXT_HAND_DELAY)
 
     # Auto-start next hand if both have chips
     if len([p for p in t.players if p.stack > 0]) < 2:
@@ -26,20 +41,24 @@ async def finish_hand(ctx, t):
     # DM hole cards
     guild = ctx.guild
     for p in t.players:
+        if p.is_bot:
+            continue
         member = guild.get_member(p.user_id)
         if not member:
             continue
         try:
             for card in p.hole:
-                await member.send(
-                    embed=discord.Embed().set_image(url=code_to_url(card_code(*card)))
-                )
+                with tracing.span("dm"):
+                    await member.send(
+                        embed=discord.Embed().set_image(url=code_to_url(card_code(*card)))
+                    )
         except Exception:
             await ctx.send(f"⚠️ Could not DM {p.name}. Enable DMs from server members.")
 
     # NEW: always attach fresh buttons for the new hand
     view = ActionView(ctx.bot, t, ctx)
     await ctx.send("🟡 " + msg + "\n" + t.table_text(), view=view)
+    bot_player.schedule(ctx, t)
 
 
 async def begin_showdown(ctx, t):
@@ -50,27 +69,20 @@ async def begin_showdown(ctx, t):
         await finish_hand(ctx, t)
         return
 
-    results = []
-    for p in alive:
-        score, best5, name = best_hand(p.hole + t.board)
-        results.append((score, p, best5, name))
-    results.sort(key=lambda x: x[0], reverse=True)
-    best_score = results[0][0]
-    winners = [r for r in results if r[0] == best_score]
-    losers = [r for r in results if r[0] != best_score]
-
-    # Distribute pot
-    share = t.pot // len(winners)
-    remainder = t.pot % len(winners)
-    for i, (_, p, _, _) in enumerate(winners):
-        p.stack += share + (1 if i < remainder else 0)
-    t.pot = 0
+    with tracing.span("evaluate"):
+        winners, losers = t.winners_and_losers()
+
+        # Distribute main pot and side pots
+        pots = t.award_showdown()
     t.street = "idle"
 
     # Winners forced to show at showdown
     lines = ["**🃏 Showdown Results:**"]
     for (_, p, best5, name) in winners:
         lines.append(f"🏆 {p.name}: {' '.join(card_str(c) for c in p.hole)} → {name}")
+    if len(pots) > 1:
+        for i, (amount, pot_winners, _) in enumerate(pots):
+            lines.append(f"{pot_label(i)} ({amount}): " + ", ".join(w.name for w in pot_winners))
     await ctx.send("\n".join(lines))
 
     if not losers:
@@ -86,22 +98,76 @@ async def begin_showdown(ctx, t):
         await ctx.send(f"{lp.name}, you lost. Type `!poker show` in 7s to reveal or do nothing to muck.")
 
         async def auto_muck(uid=lp.user_id, name=lp.name):
-            await asyncio.sleep(7)
+            await asyncio.sleep(SHOW_WINDOW_SECONDS)
             if t.pending_show.get(uid) is None and t.showdown_pending and t.pending_type == "showdown":
                 t.pending_show[uid] = "muck"
                 await ctx.send(f"{name} mucked.")
                 if all(v is not None for v in t.pending_show.values()):
                     await finish_hand(ctx, t)
 
-        ctx.bot.loop.create_task(auto_muck())
+        tracing.spawn(ctx.bot.loop, auto_muck())
+    bot_player.schedule(ctx, t)
+
+
+async def collect_runout_votes(ctx, t, alive):
+    """Give live players a window to agree on running the board 2-3 times. Returns the agreed count."""
+    t.runout_pending = True
+    t.runout_votes = {p.user_id: MAX_RUNOUTS for p in alive if p.is_bot}  # bots accept any choice
+    await ctx.send(
+        f"All-in! Everyone can type `!poker run 2` or `!poker run 3` within {RUNOUT_VOTE_SECONDS}s "
+        "to run it multiple times (all must agree; lowest choice wins)."
+    )
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + RUNOUT_VOTE_SECONDS
+    with tracing.span("wait:runout_vote"):
+        while loop.time() < deadline and len(t.runout_votes) < len(alive):
+            await asyncio.sleep(0.25)
+    t.runout_pending = False
+    if len(t.runout_votes) < len(alive):
+        return 1
+    return min(t.runout_votes.values())
+
+
+async def run_it_multiple(ctx, t, times):
+    """
+    Deal `times` independent runouts from the remaining deck, evaluate every
+    player on every board in one batch, and split the pot per runout.
+    """
+    alive = [p for p in t.players if not p.folded]
+    base = t.board[:]
+    boards = [base + [t.deck.pop() for _ in range(5 - len(base))] for _ in range(times)]
+    with tracing.span("evaluate"):
+        results = t.award_runouts(boards)
+
+    lines = [f"**🃏 Ran it {times} times:**"]
+    for i, (board, run) in enumerate(zip(boards, results)):
+        await ctx.send(
+            f"Run {i + 1}: {' '.join(card_str(c) for c in board)}",
+            embeds=board_embeds(board[len(base):]),
+        )
+        for j, (amount, winners, best) in enumerate(run):
+            label = f"Run {i + 1}" + (f" {pot_label(j).lower()}" if len(run) > 1 else "")
+            lines.append(f"{label} ({amount}): " + ", ".join(w.name for w in winners) + f" — {t.variant.name_of(best)}")
+
+    for p in alive:
+        lines.append(f"{p.name}: {' '.join(card_str(c) for c in p.hole)}")
+    await ctx.send("\n".join(lines))
+    await finish_hand(ctx, t)
 
 
 async def handle_allin_runout(ctx, t):
     """If any live player is all-in AND everyone else has matched, run out the remaining board then showdown."""
     alive = [pl for pl in t.players if not pl.folded]
     if any(pl.stack == 0 for pl in alive) and t.everyone_matched():
+        t.runout_in_progress = True  # before the first await: betting commands now bounce
+        t.snapshot_allin()
+        if len(t.board) < 5:
+            times = await collect_runout_votes(ctx, t, alive)
+            if times > 1:
+                await run_it_multiple(ctx, t, times)
+                return True
         await ctx.send("All-in confirmed. Running out the board...")
-        while t.street != "showdown":
+        while t.street in ("pre", "flop", "turn", "river"):
             t.next_street()
             if t.street == "flop":
                 await ctx.send("🃏 Flop:")
@@ -112,6 +178,7 @@ async def handle_allin_runout(ctx, t):
             elif t.street == "river":
                 await ctx.send("🃏 River:")
                 await send_board_images(ctx, [t.board[-1]])
-        await begin_showdown(ctx, t)
+        if t.street == "showdown":
+            await begin_showdown(ctx, t)
         return True
     return False
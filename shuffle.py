@@ -0,0 +1,154 @@
+"""
+Shuffle service: auditable, replayable deals.
+
+Each hand's deck is a pure function of a 32-byte seed: a SHAKE-256 stream of
+the seed drives a Fisher-Yates shuffle (rejection sampling keeps every
+permutation equally likely). The table announces sha256(seed) when the hand
+starts and the seed goes into the hand history, so anyone can check the
+commitment and replay the deck afterwards.
+
+Seeds come from os.urandom in bulk (one read per SEED_BATCH hands), and a
+background thread per variant keeps DEPTH upcoming decks ready, so dealing a
+hand is a queue pop. `use_seed(n)` switches every variant to a seeded entropy
+stream for reproducible simulations and load tests.
+"""
+import hashlib
+import os
+import queue
+import threading
+from variants import HOLDEM, VARIANTS
+
+SEED_BYTES = 32
+SEED_BATCH = 128  # seeds per os.urandom call
+DEPTH = 256       # decks kept ready per variant
+
+
+def commitment(seed):
+    """Public hash of a hand's seed, announced before any card is seen."""
+    return hashlib.sha256(seed).hexdigest()
+
+def permutation(seed, n):
+    """Deterministic uniform permutation of range(n) from `seed`."""
+    perm = list(range(n))
+    stream = hashlib.shake_256(seed)
+    size = 2 * n
+    data = stream.digest(size)
+    pos = 0
+    for i in range(n - 1, 0, -1):
+        bound = i + 1
+        limit = 256 - 256 % bound  # bytes >= limit would bias small indices
+        while True:
+            if pos == size:
+                size *= 2
+                data = stream.digest(size)  # a longer digest extends the same stream
+            b = data[pos]
+            pos += 1
+            if b < limit:
+                break
+        j = b % bound
+        perm[i], perm[j] = perm[j], perm[i]
+    return perm
+
+def deck_from_seed(seed, variant=HOLDEM):
+    """The deck (dealt from the end, like PokerTable) that `seed` produces for `variant`."""
+    cards = variant.deck()
+    return [cards[i] for i in permutation(seed, len(cards))]
+
+
+def seeded_entropy(master):
+    """Entropy source that returns the same byte stream for the same `master` value."""
+    key = hashlib.sha256(repr(master).encode()).digest()
+    counter = 0
+
+    def read(n):
+        nonlocal counter
+        counter += 1
+        return hashlib.shake_256(key + counter.to_bytes(8, "big")).digest(n)
+    return read
+
+
+class ShuffleService:
+    """Keeps `depth` (seed, deck) pairs for `variant` ready, filled by a daemon thread."""
+    def __init__(self, variant=HOLDEM, entropy=os.urandom, depth=DEPTH):
+        self.variant = variant
+        self.entropy = entropy
+        self.entropy_reads = 0
+        self.depth = depth
+        self._ready = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _seeds(self):
+        while True:
+            block = self.entropy(SEED_BYTES * SEED_BATCH)
+            self.entropy_reads += 1
+            for i in range(0, len(block), SEED_BYTES):
+                yield block[i:i + SEED_BYTES]
+
+    def _fill(self):
+        for seed in self._seeds():
+            item = (seed, deck_from_seed(seed, self.variant))
+            while not self._stop.is_set():
+                try:
+                    self._ready.put(item, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+            if self._stop.is_set():
+                return
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._fill, name=f"shuffle-{self.variant.key}", daemon=True)
+                self._thread.start()
+
+    def ready(self):
+        """Decks shuffled and waiting."""
+        return self._ready.qsize()
+
+    def close(self):
+        self._stop.set()
+
+    def deal(self):
+        """Next (seed, deck). Only waits if hands are being dealt faster than the thread shuffles."""
+        if self._thread is None:
+            self.start()
+        return self._ready.get()
+
+
+_services: dict[str, ShuffleService] = {}
+_master = None
+_services_lock = threading.Lock()
+
+def service(variant=HOLDEM):
+    with _services_lock:
+        svc = _services.get(variant.key)
+        if svc is None:
+            # seeded mode: one stream per variant, so variants don't race for bytes
+            entropy = os.urandom if _master is None else seeded_entropy((_master, variant.key))
+            svc = _services[variant.key] = ShuffleService(variant, entropy)
+        return svc
+
+def use_seed(master=None):
+    """Make every future deal reproducible from `master` (None: back to OS entropy)."""
+    global _master
+    with _services_lock:
+        for svc in _services.values():
+            svc.close()
+        _services.clear()
+        _master = master
+
+def deal(variant=HOLDEM):
+    return service(variant).deal()
+
+def replay(record):
+    """
+    Rebuild a recorded hand's deck from its seed after checking it against the
+    commitment announced at the start of the hand.
+    """
+    seed = bytes.fromhex(record["seed"])
+    if commitment(seed) != record["commitment"]:
+        raise ValueError(f"seed does not match commitment for hand {record['id']}")
+    return deck_from_seed(seed, VARIANTS[record.get("variant", HOLDEM.key)])
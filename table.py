@@ -1,12 +1,16 @@
 import asyncio
-from hand_evaluator import best_hand, card_str
+from hand_evaluator import card_str, HandStrength
+import shuffle
 from utils import deal_deck, send_board_images
+from variants import HOLDEM
 
 class Player:
-    def __init__(self, user_id, name):
+    def __init__(self, user_id, name, is_bot=False):
         self.user_id = user_id
         self.name = name
+        self.is_bot = is_bot
         self.stack = 0
+        self.start_stack = 0  # stack before blinds this hand
         self.hole = []
         self.folded = False
         self.committed = 0
@@ -17,9 +21,10 @@ class Player:
         self.committed = 0
 
 class PokerTable:
-    """Heads-up table with blinds and simple betting logic (no side pots)."""
-    def __init__(self, channel_id, sb, bb, min_buyin, max_buyin):
+    """Table with blinds, simple betting logic and side pots (blind/turn order follow heads-up rules)."""
+    def __init__(self, channel_id, sb, bb, min_buyin, max_buyin, variant=HOLDEM):
         self.channel_id = channel_id
+        self.variant = variant
         self.sb = sb
         self.bb = bb
         self.min_buyin = min_buyin
@@ -27,6 +32,8 @@ class PokerTable:
 
         self.players: list[Player] = []
         self.deck = []
+        self.seed: bytes | None = None  # this hand's shuffle seed; only its commitment is shown during play
+        self.seed_commitment: str | None = None
         self.pot = 0
         self.current_bet = 0
         self.turn_idx: int | None = None
@@ -41,11 +48,21 @@ class PokerTable:
         self.pending_type = None        # "fold" or "showdown"
         self.pending_show: dict[int, str | None] = {}  # user_id -> "show" | "muck" | None
 
+        # run-it-multiple-times vote during an all-in
+        self.runout_pending = False
+        self.runout_votes: dict[int, int] = {}  # user_id -> times (1-3)
+        self.runout_in_progress = False  # set from the all-in until the hand ends; betting is closed
+
+        # per-hand caches, reset in begin_hand
+        self.results_cache: dict[int, dict] = {}  # hand_count -> {(user_id, board): (score, best5, name)}
+        self.strength: dict[int, HandStrength] = {}  # user_id -> street-by-street hand strength
+        self.allin_snapshot: dict | None = None  # live hands/pot when an all-in ran the board out
+
     # ---- seating/buy-in ----
-    def add_player(self, user_id, name):
+    def add_player(self, user_id, name, is_bot=False):
         if any(p.user_id == user_id for p in self.players):
             return False
-        self.players.append(Player(user_id, name))
+        self.players.append(Player(user_id, name, is_bot))
         return True
 
     def set_buyin(self, user_id, amount):
@@ -67,7 +84,9 @@ class PokerTable:
         # reset per-hand state
         for p in self.players:
             p.reset_for_hand()
-        self.deck = deal_deck()
+            p.start_stack = p.stack
+        self.seed, self.deck = deal_deck(self.variant)
+        self.seed_commitment = shuffle.commitment(self.seed)
         self.pot = 0
         self.current_bet = 0
         self.board = []
@@ -79,6 +98,10 @@ class PokerTable:
         self.showdown_pending = False
         self.pending_type = None
         self.pending_show = {}
+        self.runout_pending = False
+        self.runout_votes = {}
+        self.runout_in_progress = False
+        self.allin_snapshot = None
 
         # rotate dealer (HU: dealer is SB)
         self.dealer_idx = (self.dealer_idx + 1) % len(self.players)
@@ -98,12 +121,16 @@ class PokerTable:
         self.current_bet = bb_post
         self.turn_idx = (bb_idx + 1) % len(self.players)
 
-        # deal 2 cards each
-        for _ in range(2):
+        # deal hole cards (2 each, 4 in Omaha)
+        for _ in range(self.variant.hole_cards):
             for p in self.players:
                 p.hole.append(self.deck.pop())
+        self.results_cache = {self.hand_count: {}}
+        # street-by-street hints only know hold'em rankings
+        self.strength = {p.user_id: HandStrength(p.hole) for p in self.players} if self.variant is HOLDEM else {}
 
-        return True, f"Hand #{self.hand_count} started. Dealer: {self.players[self.dealer_idx].name}"
+        return True, (f"Hand #{self.hand_count} started. Dealer: {self.players[self.dealer_idx].name}\n"
+                      f"Deck commitment: `{self.seed_commitment}`")
 
     def everyone_matched(self):
         """Everyone still live (not folded, not all-in) must have acted and matched current_bet."""
@@ -118,6 +145,16 @@ class PokerTable:
                 return False
         return True
 
+    def advance_turn(self):
+        """Move turn_idx to the next player who can still act (not folded, chips behind)."""
+        n = len(self.players)
+        for step in range(1, n + 1):
+            i = (self.turn_idx + step) % n
+            p = self.players[i]
+            if not p.folded and p.stack > 0:
+                self.turn_idx = i
+                return
+
     def next_street(self):
         """Advance betting round; reset commitments; set turn to first player (SB) post-flop."""
         self.acted_this_round = set()
@@ -125,6 +162,7 @@ class PokerTable:
             p.committed = 0
         self.current_bet = 0
 
+        dealt = len(self.board)
         if self.street == "pre":
             self.board += [self.deck.pop(), self.deck.pop(), self.deck.pop()]
             self.street = "flop"
@@ -138,19 +176,129 @@ class PokerTable:
             self.street = "showdown"
         self.turn_idx = 0  # SB first to act post-flop in HU
 
+        for hs in self.strength.values():
+            hs.add_board(self.board[dealt:])
+
     # ---- showdown/muck orchestration (called by commands via showdown.py helpers too) ----
+    def snapshot_allin(self):
+        """Record who is live, their cards, investment and the pots they can win when the board is about to be run out (for luck stats)."""
+        self.allin_snapshot = {
+            "board": self.board[:],
+            "pot": self.pot,
+            "pots": [{"amount": amount, "eligible": [p.user_id for p in eligible]}
+                     for amount, eligible in self.side_pots()],
+            "players": [
+                {"id": p.user_id, "hole": p.hole, "invested": p.start_stack - p.stack}
+                for p in self.players if not p.folded
+            ],
+        }
+
+    def hand_result(self, p, board=None):
+        """Best hand (score, best5, name) for `p` on `board` (default: the table's). Evaluated once per hand."""
+        board = self.board if board is None else board
+        cache = self.results_cache.setdefault(self.hand_count, {})
+        key = (p.user_id, tuple(board))
+        if key not in cache:
+            cache[key] = self.variant.best(p.hole, board)
+        return cache[key]
+
+    def side_pots(self):
+        """
+        Main pot first, then side pots: [(amount, eligible players)]. Each layer holds what
+        everyone put in up to the next live player's total, and only live players who put in
+        that much can win it. Call before awarding anything (it reads start_stack - stack).
+        """
+        paid = {p.user_id: p.start_stack - p.stack for p in self.players}
+        alive = [p for p in self.players if not p.folded]
+        pots, prev = [], 0
+        for level in sorted({paid[p.user_id] for p in alive}):
+            amount = sum(min(v, level) - min(v, prev) for v in paid.values())
+            if amount:
+                pots.append((amount, [p for p in alive if paid[p.user_id] >= level]))
+            prev = level
+        # chips a folded player put in above every live player's total go to the top pot
+        extra = sum(max(0, v - prev) for v in paid.values())
+        if extra and pots:
+            pots[-1] = (pots[-1][0] + extra, pots[-1][1])
+        return pots
+
+    def showdown_pots(self, board=None):
+        """[(amount, winners, best_score)] per pot, judged on `board` (default: the table's)."""
+        results = []
+        for amount, eligible in self.side_pots():
+            best = max(self.hand_result(p, board)[0] for p in eligible)
+            winners = self.seat_order([p for p in eligible if self.hand_result(p, board)[0] == best])
+            results.append((amount, winners, best))
+        return results
+
     def winners_and_losers(self):
+        """Live hands (score, player, best5, name), best first, split by whether they win any pot."""
         alive = [p for p in self.players if not p.folded]
         results = []
         for p in alive:
-            score, best5, name = best_hand(p.hole + self.board)
+            score, best5, name = self.hand_result(p)
             results.append((score, p, best5, name))
         results.sort(key=lambda x: x[0], reverse=True)
-        best_score = results[0][0]
-        winners = [r for r in results if r[0] == best_score]
-        losers = [r for r in results if r[0] != best_score]
+        won = {p.user_id for _, pot_winners, _ in self.showdown_pots() for p in pot_winners}
+        winners = [r for r in results if r[1].user_id in won]
+        losers = [r for r in results if r[1].user_id not in won]
         return winners, losers
 
+    def award_showdown(self):
+        """Pay every pot to its best eligible hands. Returns showdown_pots()."""
+        results = self.showdown_pots()
+        for amount, winners, _ in results:
+            self.award_pot(winners, amount)
+        return results
+
+    def award_pot(self, winners, amount=None):
+        """Split the pot (or `amount` of it) between winning players; odd chips go to the first winners listed."""
+        amount = self.pot if amount is None else amount
+        share = amount // len(winners)
+        remainder = amount % len(winners)
+        for i, p in enumerate(winners):
+            p.stack += share + (1 if i < remainder else 0)
+        self.pot -= amount
+
+    def award_runouts(self, boards):
+        """
+        Split every pot evenly across several complete boards (run it twice/three times).
+        Every live player is scored on every board by one evaluate_batch call, grouped by
+        board so each board's cards are tallied once and shared by all players.
+        Returns, per board, [(amount, winners, best_score)] per pot (main pot first);
+        run 1 gets each pot's odd chips.
+        """
+        pots = self.side_pots()
+        alive = [p for p in self.players if not p.folded]
+        scores = self.variant.evaluate_batch([(p.hole, board) for board in boards for p in alive])
+        runs = len(boards)
+        results = []
+        for i in range(runs):
+            run_scores = dict(zip((p.user_id for p in alive), scores[i * len(alive):(i + 1) * len(alive)]))
+            run = []
+            for pot, eligible in pots:
+                amount = pot // runs + (pot % runs if i == 0 else 0)
+                best = max(run_scores[p.user_id] for p in eligible)
+                winners = self.seat_order([p for p in eligible if run_scores[p.user_id] == best])
+                self.award_pot(winners, amount)
+                run.append((amount, winners, best))
+            results.append(run)
+        self.board = boards[0]
+        self.street = "idle"
+        return results
+
+    def max_raise(self, p):
+        """Largest raise (on top of the call) `p` may make: a pot-sized raise in pot-limit games."""
+        to_call = max(0, self.current_bet - p.committed)
+        if self.variant.pot_limit:
+            return min(p.stack - to_call, self.pot + to_call)  # call, then raise the pot
+        return p.stack - to_call
+
+    def seat_order(self, players):
+        """Sort players by seat, starting left of the dealer (odd-chip order)."""
+        n = len(self.players)
+        return sorted(players, key=lambda p: (self.players.index(p) - self.dealer_idx - 1) % n)
+
     def table_text(self):
         from hand_evaluator import card_str  # local import to avoid circular
         btxt = " ".join(card_str(c) for c in self.board) if self.board else "—"
@@ -181,7 +329,7 @@ class PokerTable:
 
     async def resolve_show_or_muck(self, ctx, user_id: int, action: str):
         """Used by !poker show / !poker muck after fold or showdown."""
-        from hand_evaluator import card_str, best_hand
+        from hand_evaluator import card_str
         # Validate
         if not self.showdown_pending or user_id not in self.pending_show:
             return
@@ -190,7 +338,7 @@ class PokerTable:
 
         if self.pending_type == "showdown":
             # Loser showing at showdown: show rank on board
-            score, best5, name = best_hand(p.hole + self.board)
+            score, best5, name = self.hand_result(p)
             if action == "show":
                 await ctx.send(f"{p.name}: {' '.join(card_str(c) for c in p.hole)} → {name}")
             else:
@@ -0,0 +1,68 @@
+import time
+from bot_player import PREFLOP_EQUITY, choose_action, preflop_key, sample_equity
+from headless import legal_actions
+from table import PokerTable
+
+
+def make_table():
+    t = PokerTable(0, 10, 20, 1000, 1000)
+    for uid in (-1, -2):
+        t.add_player(uid, f"bot{-uid}", is_bot=True)
+        t.set_buyin(uid, 1000)
+    t.begin_hand()
+    return t
+
+def test_preflop_table_covers_all_classes():
+    assert len(PREFLOP_EQUITY) == 169
+    assert preflop_key([(12, 0), (11, 0)]) == "AKs"
+    assert preflop_key([(3, 2), (8, 1)]) == "T5o"
+    assert PREFLOP_EQUITY["AA"] > PREFLOP_EQUITY["KK"] > PREFLOP_EQUITY["72o"]
+
+def test_equity_of_the_nuts_is_one():
+    # Hero holds A♠ K♠ on Q♠ J♠ T♠ 2♥ 3♦: a royal flush nobody can tie
+    board = [(10, 0), (9, 0), (8, 0), (0, 1), (1, 2)]
+    assert sample_equity([(12, 0), (11, 0)], board, 1, samples=200) == 1.0
+
+def test_board_royal_flush_is_a_chop():
+    # Royal flush on board, hero holds nothing that matters: everyone chops
+    board = [(12, 0), (11, 0), (10, 0), (9, 0), (8, 0)]
+    assert sample_equity([(0, 1), (1, 2)], board, 1, samples=200) == 0.5
+
+def test_slow_decision_falls_back_within_the_budget(monkeypatch):
+    import asyncio
+    import bot_player
+
+    def slow(t, p, budget, rng=None):
+        time.sleep(0.3)
+        return "raise", 100
+    monkeypatch.setattr(bot_player, "choose_action", slow)
+
+    played = []
+    class Command:
+        def __init__(self, name):
+            self.name = name
+        async def callback(self, ctx, *args):
+            played.append(self.name)
+    class Bot:
+        def get_command(self, name):
+            return Command(name)
+    class Ctx:
+        bot, channel, guild = Bot(), None, None
+
+    async def timed_turn():
+        start = time.perf_counter()
+        await bot_player.take_turn(Ctx(), t, deadline=0.05)
+        return time.perf_counter() - start  # asyncio.run then waits for the abandoned worker
+
+    t = make_table()
+    assert asyncio.run(timed_turn()) < 0.1
+    assert played == ["fold"]  # facing the big blind: fold, not check
+
+def test_choose_action_respects_deadline():
+    t = make_table()
+    t.next_street()  # flop: forces sampling instead of the preflop table
+    p = t.players[t.turn_idx]
+    start = time.perf_counter()
+    action, amount = choose_action(t, p, budget=0.05)
+    assert time.perf_counter() - start < 0.05
+    assert action in legal_actions(t, p)
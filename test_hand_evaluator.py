@@ -69,3 +69,50 @@ def test_exact_tie_two_pair():
     assert h[0] == v[0], f"Should be a tie, got Hero {h} vs Villain {v}"
 
 
+
+def test_evaluate_7_matches_best_hand():
+    import random
+    from hand_evaluator import evaluate_7
+    rng = random.Random(1234)
+    deck = [(r, s) for r in range(13) for s in range(4)]
+    for _ in range(3000):
+        cards = rng.sample(deck, rng.choice([5, 6, 7]))
+        assert evaluate_7(cards) == best_hand(cards)[0], cards
+
+def test_hand_strength_by_street():
+    from hand_evaluator import HandStrength
+    hs = HandStrength([(12, 0), (8, 0)])          # A♠ T♠
+    hs.add_board([(12, 1), (5, 0), (1, 0)])       # A♥ 7♠ 3♠
+    assert hs.describe() == "Top Pair + Flush Draw"
+    hs.add_board([(9, 2)])                        # J♦
+    assert hs.describe() == "Top Pair + Flush Draw"
+    hs.add_board([(3, 0)])                        # 5♠
+    assert hs.describe() == "Flush"
+
+def test_hand_strength_set_and_straight_draws():
+    from hand_evaluator import HandStrength
+    hs = HandStrength([(4, 0), (4, 1)])           # 6♠ 6♥
+    hs.add_board([(4, 2), (11, 3), (0, 0)])       # 6♦ K♣ 2♠
+    assert hs.describe() == "Set"
+    hs = HandStrength([(7, 0), (6, 1)])           # 9♠ 8♥
+    hs.add_board([(5, 2), (4, 3), (12, 0)])       # 7♦ 6♣ A♠
+    assert hs.describe() == "High Card + Open-Ended Straight Draw"
+    hs = HandStrength([(7, 0), (6, 1)])           # 9♠ 8♥
+    hs.add_board([(5, 2), (3, 3), (12, 0)])       # 7♦ 5♣ A♠
+    assert hs.describe() == "High Card + Gutshot"
+
+def test_hand_strength_category_tracks_evaluate_7():
+    import random
+    from hand_evaluator import HandStrength, evaluate_7
+    rng = random.Random(11)
+    deck = [(r, s) for r in range(13) for s in range(4)]
+    for _ in range(2000):
+        cards = rng.sample(deck, 7)
+        hs = HandStrength(cards[:2])
+        for street in (cards[2:5], cards[5:6], cards[6:7]):
+            hs.add_board(street)
+            score = evaluate_7(hs.hole + hs.board)
+            category, pair = hs.category()
+            assert category == score[0], cards
+            if category == 1:
+                assert pair == score[1]
@@ -0,0 +1,62 @@
+import asyncio
+import random
+import history
+import loadtest
+import showdown
+
+
+def test_scripted_tables_finish_through_real_handlers(tmp_path, monkeypatch):
+    monkeypatch.setattr(showdown, "NEXT_HAND_DELAY", 0)
+    monkeypatch.setattr(showdown, "SHOW_WINDOW_SECONDS", 0.1)
+    monkeypatch.setattr(showdown, "RUNOUT_VOTE_SECONDS", 0.1)
+    monkeypatch.setattr(history, "HISTORY_PATH", str(tmp_path / "h.jsonl"))
+    api = loadtest.FakeAPI(latency=0.001, jitter=0, rate_limit=0.05, retry_after=0.01, rng=random.Random(3))
+
+    stats = asyncio.run(loadtest.run(5, 2, api, seed=3))
+    assert stats["hands"] == 10
+    assert stats["timeouts"] == 0
+    assert stats["actions"] == len(stats["ack"]) > 0
+    assert api.calls["message.edit"] >= stats["actions"]  # one per click, plus 429 retries
+
+def test_action_during_runout_vote_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(showdown, "NEXT_HAND_DELAY", 0)
+    monkeypatch.setattr(showdown, "SHOW_WINDOW_SECONDS", 0.1)
+    monkeypatch.setattr(showdown, "RUNOUT_VOTE_SECONDS", 0.3)
+    monkeypatch.setattr(history, "HISTORY_PATH", str(tmp_path / "h.jsonl"))
+    api = loadtest.FakeAPI(latency=0, jitter=0, rate_limit=0)
+
+    async def scenario():
+        bot = loadtest.pokerbot_5d.bot
+        bot.loop = asyncio.get_running_loop()
+        channel = loadtest.FakeChannel(999, api)
+        members = [loadtest.FakeMember(9991, api), loadtest.FakeMember(9992, api)]
+        guild = loadtest.FakeGuild(members)
+        ctxs = {m.id: loadtest.FakeContext(m, channel, guild, bot) for m in members}
+        first = ctxs[9991]
+        await loadtest.command("start", first, 5, 10, 500, 1000)
+        for m in members:
+            await loadtest.command("join", ctxs[m.id])
+            await loadtest.command("buyin", ctxs[m.id], 1000)
+        await loadtest.command("begin", first)
+        t = loadtest.pokerbot_5d.tables[999]
+        try:
+            await loadtest.command("allin", ctxs[t.players[t.turn_idx].user_id])
+            caller = ctxs[t.players[t.turn_idx].user_id]
+            runout = asyncio.create_task(loadtest.command("call", caller))
+            while not t.runout_pending:
+                await asyncio.sleep(0.01)
+            hand = t.hand_count
+            await loadtest.command("check", ctxs[t.players[t.turn_idx].user_id])
+            assert channel.last_content == "⏳ The board is being run out."
+            await asyncio.wait_for(runout, timeout=5)
+            assert t.hand_count == hand + 1 or t.street == "idle"
+        finally:
+            del loadtest.pokerbot_5d.tables[999]
+
+    asyncio.run(scenario())
+
+def test_sweep_saturates_on_lag_or_response_p99():
+    calm = {"lag": [0.001] * 100, "ack": [0.05] * 100}
+    assert loadtest.saturation(calm, 0.1, 1.0) is None
+    assert "loop lag" in loadtest.saturation({**calm, "lag": [0.2] * 100}, 0.1, 1.0)
+    assert "action→response" in loadtest.saturation({**calm, "ack": [1.5] * 100}, 0.1, 1.0)
@@ -0,0 +1,80 @@
+import history
+import luck
+
+
+def allin_record(hand_id, holes, board, pot, nets, invested):
+    players = [{"id": i + 1, "name": f"p{i + 1}", "hole": h, "net": n} for i, (h, n) in enumerate(zip(holes, nets))]
+    return {
+        "id": hand_id, "channel": 1, "hand": 1, "board": board, "players": players,
+        "allin": {
+            "board": board, "pot": pot,
+            "players": [{"id": i + 1, "hole": h, "invested": inv} for i, (h, inv) in enumerate(zip(holes, invested))],
+        },
+    }
+
+def test_runout_equity_exact_on_the_turn():
+    # A♠ A♥ vs K♠ K♥ on 2♦ 7♣ 9♦ J♣: kings need one of the two remaining kings (44 rivers)
+    eq = luck.runout_equity([[(12, 0), (12, 1)], [(11, 0), (11, 1)]], [(0, 2), (5, 3), (7, 2), (9, 3)])
+    assert abs(eq[1] - 2 / 44) < 1e-9
+    assert abs(sum(eq) - 1) < 1e-9
+
+def test_suit_relabelling_groups_identical_spots():
+    a = luck.canonical([[(12, 0), (12, 1)], [(11, 2), (10, 2)]], [])
+    b = luck.canonical([[(12, 3), (12, 2)], [(11, 1), (10, 1)]], [])
+    assert a == b
+
+def test_update_streams_only_new_hands(tmp_path):
+    hist, cache = tmp_path / "h.jsonl", tmp_path / "c.json"
+    river = [(0, 2), (5, 3), (7, 2), (9, 3), (1, 1)]
+    aces, kings = [(12, 0), (12, 1)], [(11, 0), (11, 1)]
+    history.append_hand(allin_record("h1", [aces, kings], river, 200, [100, -100], [100, 100]), hist)
+
+    report = luck.report(luck.update(hist, cache))
+    assert report[1] == ("p1", 1, 100, 100.0)
+    assert report[2] == ("p2", 1, -100, -100.0)
+
+    turn = river[:4]
+    history.append_hand(allin_record("h2", [kings, aces], turn, 200, [100, -100], [100, 100]), hist)
+    history.append_hand({"id": "h3", "players": [], "allin": None}, hist)
+    data = luck.update(hist, cache)
+    assert set(data["hands"]) == {"h1", "h2"}
+    assert data["offset"] == hist.stat().st_size
+    report = luck.report(data)
+    # p1 held kings on the turn and hit: EV 200 * 2/44 - 100, actual +100
+    assert report[1][1] == 2
+    assert abs(report[1][3] - (100 + 200 * 2 / 44 - 100)) < 1e-9
+
+def test_concurrent_updates_do_not_clobber_the_cache(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    hist, cache = tmp_path / "h.jsonl", tmp_path / "c.json"
+    river = [(0, 2), (5, 3), (7, 2), (9, 3), (1, 1)]
+    aces, kings = [(12, 0), (12, 1)], [(11, 0), (11, 1)]
+    for i in range(20):
+        history.append_hand(allin_record(f"h{i}", [aces, kings], river, 200, [100, -100], [100, 100]), hist)
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: luck.update(hist, cache), range(8)))
+    assert len(luck.load_cache(cache)["hands"]) == 20
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["c.json", "h.jsonl"]  # no temp files left behind
+
+def test_side_pot_ev_with_unequal_stacks(tmp_path):
+    from table import PokerTable
+    hist, cache = tmp_path / "h.jsonl", tmp_path / "c.json"
+    aces, kings = [(12, 0), (12, 1)], [(11, 2), (11, 3)]
+    flop = [(0, 2), (5, 3), (7, 0)]
+    t = PokerTable(0, 10, 20, 100, 1000)
+    for uid, (hole, invested) in enumerate([(aces, 1000), (kings, 100)], start=1):
+        t.add_player(uid, f"p{uid}")
+        p = t.players[-1]
+        p.hole, p.start_stack, p.stack = hole, invested, 0
+    t.pot, t.board = 1100, flop
+    t.snapshot_allin()
+    rec = allin_record("h1", [aces, kings], flop, 1100, [100, -100], [1000, 100])
+    rec["allin"] = t.allin_snapshot
+    history.append_hand(rec, hist)
+
+    report = luck.report(luck.update(hist, cache))
+    # only the 200-chip main pot is contested; the 900 the short stack can't match goes back to p1
+    eq = luck.runout_equity([aces, kings], flop)
+    assert abs(report[1][3] - (200 * eq[0] + 900 - 1000)) < 1e-9
+    assert abs(report[2][3] - (200 * eq[1] - 100)) < 1e-9
+    assert report[1][3] > 0 > report[2][3]
@@ -0,0 +1,58 @@
+import pytest
+
+import history
+import shuffle
+from table import PokerTable
+from variants import SHORT_DECK
+
+
+def test_permutation_is_deterministic_and_complete():
+    seed = bytes(range(32))
+    perm = shuffle.permutation(seed, 52)
+    assert perm == shuffle.permutation(seed, 52)
+    assert sorted(perm) == list(range(52))
+    assert perm != shuffle.permutation(bytes(32), 52)
+    assert sorted(shuffle.deck_from_seed(seed, SHORT_DECK)) == sorted(SHORT_DECK.deck())
+
+def test_service_reads_entropy_in_bulk():
+    reads = []
+    def entropy(n):
+        reads.append(n)
+        return bytes(n)
+    svc = shuffle.ShuffleService(entropy=entropy, depth=16)
+    decks = [svc.deal() for _ in range(200)]
+    svc.close()
+    assert len(reads) <= 3
+    seed, deck = decks[0]
+    assert len(seed) == shuffle.SEED_BYTES and deck == shuffle.deck_from_seed(seed)
+
+def test_seeded_mode_is_reproducible(seed_decks):
+    seed_decks(11)
+    first = [shuffle.deal() for _ in range(5)]
+    seed_decks(11)
+    assert [shuffle.deal() for _ in range(5)] == first
+    seed_decks(12)
+    assert shuffle.deal() != first[0]
+
+def test_recorded_hand_replays_from_its_seed():
+    t = PokerTable(0, 10, 20, 100, 1000)
+    for uid in (1, 2, 3):
+        t.add_player(uid, f"p{uid}")
+        t.set_buyin(uid, 1000)
+    ok, msg = t.begin_hand()
+    assert t.seed_commitment in msg
+    while t.street != "showdown":
+        t.next_street()
+    record = history.hand_record(t)
+
+    deck = shuffle.replay(record)
+    holes = {p["id"]: [] for p in record["players"]}
+    for _ in range(2):
+        for p in record["players"]:
+            holes[p["id"]].append(deck.pop())
+    assert holes == {p["id"]: p["hole"] for p in record["players"]}
+    assert [deck.pop() for _ in range(5)] == record["board"]
+
+    record["seed"] = bytes(32).hex()
+    with pytest.raises(ValueError):
+        shuffle.replay(record)
@@ -0,0 +1,89 @@
+from headless import settle_showdown
+from table import PokerTable
+
+
+def make_table(n=2, stack=1000):
+    t = PokerTable(0, 10, 20, 100, 1000)
+    for uid in range(1, n + 1):
+        t.add_player(uid, f"p{uid}")
+        t.set_buyin(uid, stack)
+    return t
+
+def set_invested(t, amounts, folded=()):
+    """Put the table at the end of betting: each player has put amounts[i] in and is all-in."""
+    for p, amount in zip(t.players, amounts):
+        p.start_stack, p.stack = amount, 0
+        p.folded = p in folded
+    t.pot = sum(amounts)
+
+def test_run_it_twice_split_with_odd_chips():
+    t = make_table(3)
+    t.begin_hand()
+    a, b, c = t.players
+    a.hole = [(12, 0), (12, 1)]   # A♠ A♥
+    b.hole = [(11, 0), (11, 1)]   # K♠ K♥
+    set_invested(t, [1000, 1000, 1], folded=[c])
+    run1 = [(0, 2), (3, 3), (7, 2), (9, 3), (5, 1)]    # blanks: aces hold
+    run2 = [(11, 2), (3, 2), (7, 3), (9, 2), (5, 0)]   # K♦: kings win
+    results = t.award_runouts([run1, run2])
+    assert [run[0][0] for run in results] == [1001, 1000]
+    assert results[0][0][1] == [a] and results[1][0][1] == [b]
+    assert (a.stack, b.stack, t.pot) == (1001, 1000, 0)
+    assert t.street == "idle"
+
+def test_chopped_runout_odd_chip_goes_left_of_dealer():
+    t = make_table(4)
+    t.begin_hand()
+    for p in t.players:
+        p.hole = [(0, p.user_id % 4), (1, p.user_id % 4)]
+    dealer = t.players[t.dealer_idx]
+    set_invested(t, [1 if p is dealer else 100 for p in t.players], folded=[dealer])
+    royal = [(12, 0), (11, 0), (10, 0), (9, 0), (8, 0)]
+    results = t.award_runouts([royal, royal])
+    first_left = t.players[(t.dealer_idx + 1) % 4]
+    assert results[0][0][1][0] is first_left
+    assert sum(p.stack for p in t.players) == 301
+    assert first_left.stack == 101
+
+def test_short_all_in_only_wins_the_main_pot():
+    t = make_table(3)
+    t.begin_hand()
+    short, b, c = t.players
+    short.hole = [(12, 0), (12, 1)]   # A♠ A♥
+    b.hole = [(11, 0), (11, 1)]       # K♠ K♥
+    c.hole = [(10, 0), (10, 1)]       # Q♠ Q♥
+    set_invested(t, [50, 1000, 1000])
+    t.board = [(0, 2), (3, 3), (7, 2), (9, 3), (5, 1)]
+    t.street = "river"
+    assert [(amount, len(eligible)) for amount, eligible in t.side_pots()] == [(150, 3), (1900, 2)]
+    assert settle_showdown(t) == [short, b]
+    assert (short.stack, b.stack, c.stack, t.pot) == (150, 1900, 0, 0)
+
+def test_side_pot_split_across_runouts():
+    t = make_table(3)
+    t.begin_hand()
+    short, b, c = t.players
+    short.hole = [(12, 0), (12, 1)]   # A♠ A♥
+    b.hole = [(11, 0), (11, 1)]       # K♠ K♥
+    c.hole = [(1, 0), (2, 1)]         # 3♠ 4♥
+    set_invested(t, [50, 500, 500])
+    run1 = [(0, 2), (3, 3), (7, 2), (9, 3), (5, 1)]    # blanks: aces, then kings
+    run2 = [(11, 2), (3, 2), (7, 3), (9, 2), (5, 0)]   # K♦: kings scoop
+    results = t.award_runouts([run1, run2])
+    assert [[(amount, winners) for amount, winners, _ in run] for run in results] == [
+        [(75, [short]), (450, [b])],
+        [(75, [b]), (450, [b])],
+    ]
+    assert (short.stack, b.stack, c.stack) == (75, 975, 0)
+
+def test_showdown_results_cached_per_hand():
+    t = make_table()
+    t.begin_hand()
+    while t.street != "showdown":
+        t.next_street()
+    winners, losers = t.winners_and_losers()
+    cached = t.results_cache[t.hand_count]
+    assert len(cached) == 2
+    assert t.hand_result(t.players[0]) is cached[(t.players[0].user_id, tuple(t.board))]
+    t.begin_hand()
+    assert t.results_cache == {t.hand_count: {}}
@@ -0,0 +1,68 @@
+import random
+import pytest
+from headless import play_hand, random_policy
+from tournament import BlindClock, Tournament
+
+
+@pytest.fixture(autouse=True)
+def decks(seed_decks):
+    seed_decks(7)
+
+
+def make_tourney(n, seats=6, stack=1000, seed=7):
+    rng = random.Random(seed)
+    clock = BlindClock(level_seconds=300, started_at=0)
+    return Tournament([(i, f"p{i}") for i in range(n)], stack, seats=seats, clock=clock, rng=rng), rng
+
+def test_initial_seating_balanced():
+    t, _ = make_tourney(100, seats=9)
+    counts = [len(tb.players) for tb in t.tables.values()]
+    assert len(counts) == 12
+    assert max(counts) - min(counts) <= 1
+    assert sum(counts) == 100
+
+def test_full_tournament_stays_balanced_and_conserves_chips():
+    t, rng = make_tourney(150)
+    policy = random_policy(rng)
+    total = 150 * 1000
+    now = 0
+    while not t.finished:
+        for cid in list(t.tables):
+            if cid not in t.tables:
+                continue
+            t.seat_arrivals(cid)
+            play_hand(t.tables[cid], policy)
+            t.hand_complete(cid)
+            counts = list(t._count.values())
+            assert max(counts) - min(counts) <= 1
+            assert len(t.tables) == max(1, -(-t.remaining // t.seats))
+            if t.finished:
+                break
+        now += 60
+        t.tick(now)
+
+    standings = t.standings()
+    assert len(standings) == 150
+    assert len({p.user_id for p in standings}) == 150
+    assert standings[0].stack == total
+
+def test_blind_clock_updates_every_table():
+    t, _ = make_tourney(30)
+    assert t.tick(299) is None
+    assert t.tick(300) == 1
+    assert all((tb.sb, tb.bb) == t.clock.levels[1] for tb in t.tables.values())
+
+def test_players_only_move_from_tables_between_hands():
+    t, _ = make_tourney(18, seats=6)
+    a, b, c = t.tables
+    for cid in t.tables:
+        t.seat_arrivals(cid)  # every table mid-hand
+    for p in t.tables[a].players[:2]:
+        p.stack = 0
+    busted, moves = t.hand_complete(a)
+    assert len(busted) == 2 and moves == []  # b and c are still playing
+    assert t.remaining == 16
+
+    _, moves = t.hand_complete(b)
+    assert [(src, dst) for _, src, dst in moves] == [(b, a)]
+    assert sorted(t._count.values()) == [5, 5, 6]
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import pytest
+import tracing
+
+
+def test_slow_action_logged_with_breakdown(caplog, monkeypatch):
+    monkeypatch.setattr(tracing, "SLOW_ACTION_MS", 5)
+
+    @tracing.traced("inner")
+    async def inner():
+        with tracing.span("send"):
+            await asyncio.sleep(0.01)
+
+    @tracing.traced("outer")
+    async def outer():
+        tracing.mark("validate")
+        await inner()  # joins the outer action instead of starting its own
+        with tracing.span("wait:next_hand"):
+            await asyncio.sleep(0.01)
+
+    with caplog.at_level(logging.WARNING, logger="pokerbot.trace"):
+        asyncio.run(outer())
+    assert len(caplog.records) == 1
+    msg = caplog.records[0].getMessage()
+    assert msg.startswith("slow action outer")
+    assert "validate" in msg and "send" in msg and "wait:next_hand" in msg
+
+def test_waits_do_not_count_as_busy(caplog, monkeypatch):
+    monkeypatch.setattr(tracing, "SLOW_ACTION_MS", 5)
+
+    @tracing.traced("idle")
+    async def idle():
+        with tracing.span("wait:runout_vote"):
+            await asyncio.sleep(0.02)
+
+    with caplog.at_level(logging.WARNING, logger="pokerbot.trace"):
+        asyncio.run(idle())
+    assert not caplog.records
+
+def test_spawned_task_does_not_join_the_running_action():
+    seen = {}
+
+    @tracing.traced("bot")
+    async def bot_turn():
+        seen["bot"] = tracing._current.get().name
+
+    @tracing.traced("human")
+    async def human():
+        await tracing.spawn(asyncio.get_running_loop(), bot_turn())  # human's action is still open
+        seen["human"] = tracing._current.get().name
+
+    asyncio.run(human())
+    assert seen == {"bot": "bot", "human": "human"}
+
+def test_span_outside_action_is_noop():
+    with tracing.span("send"):
+        pass
+    tracing.mark("validate")
+
+def test_profile_error_handler_only_swallows_what_it_answers():
+    import pokerbot_5d
+    from discord.ext import commands
+
+    class Ctx:
+        replies = []
+        async def reply(self, text):
+            self.replies.append(text)
+
+    ctx = Ctx()
+    asyncio.run(pokerbot_5d.profile_error(ctx, commands.BadArgument("abc")))
+    assert ctx.replies and "Usage" in ctx.replies[-1]
+    with pytest.raises(RuntimeError):
+        asyncio.run(pokerbot_5d.profile_error(ctx, RuntimeError("boom")))
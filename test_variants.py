@@ -0,0 +1,105 @@
+import random
+from itertools import combinations
+
+from hand_evaluator import best_hand, evaluate_5
+from headless import ALLIN, legal_actions, play_hand, random_policy
+from table import PokerTable
+from variants import HOLDEM, PLO, SHORT_DECK
+
+
+def test_holdem_tables_match_evaluate_5():
+    rng = random.Random(3)
+    for _ in range(2000):
+        cards = rng.sample(HOLDEM.deck(), 5)
+        assert HOLDEM.evaluate_5(cards) == evaluate_5(cards)
+
+def test_short_deck_flush_beats_full_house():
+    board = [(10, 0), (10, 1), (4, 0), (7, 0), (5, 2)]  # Q♠ Q♥ 6♠ 9♠ 7♦
+    flush = SHORT_DECK.best([(12, 0), (8, 0)], board)   # A♠ T♠
+    boat = SHORT_DECK.best([(10, 2), (4, 1)], board)    # Q♦ 6♥
+    assert flush[2] == "Flush" and boat[2] == "Full House"
+    assert flush[0] > boat[0]
+
+def test_short_deck_ace_plays_low_with_six():
+    board = [(5, 2), (6, 3), (7, 0), (10, 1), (11, 2)]  # 7♦ 8♣ 9♠ Q♥ K♦
+    score, best5, name = SHORT_DECK.best([(12, 0), (4, 1)], board)  # A♠ 6♥
+    assert name == "Straight" and score == (4, 9)   # A-6-7-8-9 is the lowest straight
+    assert SHORT_DECK.score([(8, 0), (4, 1)], board) > score          # T♠ 6♥: ten-high
+
+def test_plo_matches_brute_force():
+    rng = random.Random(5)
+    for _ in range(300):
+        cards = rng.sample(PLO.deck(), 9)
+        hole, board = cards[:4], cards[4:]
+        expected = max(evaluate_5(list(h) + list(b))[0]
+                       for h in combinations(hole, 2) for b in combinations(board, 3))
+        assert PLO.score(hole, board) == expected
+        assert PLO.best(hole, board)[0] == expected
+
+def test_plo_must_use_exactly_two_hole_cards():
+    hole = [(12, 0), (2, 1), (3, 2), (4, 3)]            # one spade in hand
+    board = [(11, 0), (10, 0), (9, 0), (8, 0), (0, 1)]  # four spades on board
+    assert best_hand(hole + board)[2] == "Straight Flush"
+    assert PLO.best(hole, board)[2] != "Flush"
+    assert PLO.best(hole, board)[0] < best_hand(hole + board)[0]
+
+def test_pot_limit_caps_raises_and_plays_out(seed_decks):
+    seed_decks(7)
+    t = PokerTable(0, 10, 20, 100, 1000, PLO)
+    for uid in (1, 2):
+        t.add_player(uid, f"p{uid}")
+        t.set_buyin(uid, 1000)
+    t.begin_hand()
+    assert all(len(p.hole) == 4 for p in t.players)
+    p = t.players[t.turn_idx]
+    assert t.max_raise(p) == t.pot + (t.current_bet - p.committed)  # call 10, then raise the 40 pot
+    assert ALLIN not in legal_actions(t, p)
+
+    rng = random.Random(7)
+    for _ in range(50):
+        for q in t.players:
+            if q.stack == 0:
+                q.stack = 1000
+        play_hand(t, random_policy(rng))
+    assert t.pot == 0
+
+def test_short_deck_run_it_twice_names_hands_by_variant(monkeypatch):
+    import asyncio
+    import loadtest
+    import showdown
+
+    async def no_finish(ctx, t):
+        pass
+    monkeypatch.setattr(showdown, "finish_hand", no_finish)
+
+    t = PokerTable(0, 10, 20, 100, 1000, SHORT_DECK)
+    for uid in (1, 2):
+        t.add_player(uid, f"p{uid}")
+        t.set_buyin(uid, 1000)
+    t.begin_hand()
+    a, b = t.players
+    a.hole = [(12, 0), (8, 0)]    # A♠ T♠
+    b.hole = [(10, 2), (4, 1)]    # Q♦ 6♥
+    for p in t.players:
+        p.stack = 0
+    t.pot = 2000
+    t.board = [(10, 0), (10, 1), (4, 0)]                      # Q♠ Q♥ 6♠
+    t.deck = [(6, 3), (9, 1), (5, 2), (7, 0)]   # run 1: 9♠ 7♦ (flush), run 2: J♥ 8♣ (full house)
+    assert t.variant.name_of(SHORT_DECK.score(a.hole, t.board + [(7, 0), (5, 2)])) == "Flush"
+
+    api = loadtest.FakeAPI(latency=0, jitter=0, rate_limit=0)
+    channel = loadtest.FakeChannel(1, api)
+    ctx = loadtest.FakeContext(loadtest.FakeMember(1, api), channel, None, None)
+    asyncio.run(showdown.run_it_multiple(ctx, t, 2))
+    assert "Run 1 (1000): p1 — Flush" in channel.last_content
+    assert "Run 2 (1000): p2 — Full House" in channel.last_content
+
+def test_evaluate_batch_matches_score_per_hand():
+    rng = random.Random(11)
+    for variant in (HOLDEM, SHORT_DECK, PLO):
+        hands = []
+        for _ in range(300):
+            cards = rng.sample(variant.deck(), 5 + 3 * variant.hole_cards)
+            board = cards[:5]
+            hands += [(cards[5 + i * variant.hole_cards:5 + (i + 1) * variant.hole_cards], board) for i in range(3)]
+        assert variant.evaluate_batch(hands) == [variant.score(hole, board) for hole, board in hands]
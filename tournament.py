@@ -0,0 +1,247 @@
+import asyncio
+import random
+import time
+from table import PokerTable
+
+# (small blind, big blind) per level
+DEFAULT_LEVELS = [
+    (10, 20), (15, 30), (25, 50), (50, 100), (75, 150), (100, 200),
+    (150, 300), (200, 400), (300, 600), (400, 800), (600, 1200), (1000, 2000),
+]
+
+
+class BlindClock:
+    """One clock for the whole tournament; every table reads the same level."""
+    def __init__(self, levels=DEFAULT_LEVELS, level_seconds=600, started_at=None):
+        self.levels = levels
+        self.level_seconds = level_seconds
+        self.started_at = time.monotonic() if started_at is None else started_at
+
+    def level_at(self, now):
+        return min(int((now - self.started_at) // self.level_seconds), len(self.levels) - 1)
+
+    def seconds_to_next(self, now):
+        return self.level_seconds - (now - self.started_at) % self.level_seconds
+
+
+class _TableSet:
+    """Set of channel ids with O(1) add, discard and pick-any (swap-remove list + index)."""
+    __slots__ = ("_items", "_pos")
+
+    def __init__(self):
+        self._items: list[int] = []
+        self._pos: dict[int, int] = {}
+
+    def add(self, cid):
+        if cid not in self._pos:
+            self._pos[cid] = len(self._items)
+            self._items.append(cid)
+
+    def discard(self, cid):
+        i = self._pos.pop(cid, None)
+        if i is None:
+            return
+        last = self._items.pop()
+        if last != cid:
+            self._items[i] = last
+            self._pos[last] = i
+
+    def any(self):
+        return self._items[-1] if self._items else None
+
+
+class Tournament:
+    """
+    Multi-table tournament controller owning many PokerTables.
+
+    Tables are tracked in buckets by player count (counts are bounded by `seats`),
+    with a second set of buckets holding only tables between hands. Finding the
+    fullest/emptiest (idle) table is a scan over at most `seats + 1` buckets,
+    independent of the number of tables, and the player total is kept as a
+    running count. Each elimination triggers at most one player move or one
+    table break, so rebalancing costs O(seats) per move.
+
+    A table is busy from `seat_arrivals` (called right before its hand starts)
+    until `hand_complete`; players are only taken from idle tables.
+    """
+    def __init__(self, entrants, starting_stack, seats=9, clock=None, channel_ids=None, rng=random):
+        self.seats = seats
+        self.starting_stack = starting_stack
+        self.clock = clock or BlindClock()
+        self.level = 0
+        self.finish_order: list = []  # busted players, first out first
+        self.moves = 0
+        self.tables_broken = 0
+
+        entrants = list(entrants)
+        rng.shuffle(entrants)
+        n_tables = max(1, -(-len(entrants) // seats))
+        channel_ids = list(channel_ids) if channel_ids else list(range(1, n_tables + 1))
+        if len(channel_ids) < n_tables:
+            raise ValueError(f"Need {n_tables} channels for {len(entrants)} entrants.")
+
+        sb, bb = self.clock.levels[0]
+        self.tables: dict[int, PokerTable] = {}
+        self._arrivals: dict[int, list] = {}
+        self._count: dict[int, int] = {}
+        self._by_count = [_TableSet() for _ in range(seats + 1)]
+        self._idle_by_count = [_TableSet() for _ in range(seats + 1)]
+        self._busy: set[int] = set()
+        self._remaining = len(entrants)
+        for cid in channel_ids[:n_tables]:
+            self.tables[cid] = PokerTable(cid, sb, bb, starting_stack, starting_stack)
+            self._arrivals[cid] = []
+        for i, (user_id, name) in enumerate(entrants):
+            t = self.tables[channel_ids[i % n_tables]]
+            t.add_player(user_id, name)
+            t.set_buyin(user_id, starting_stack)
+        for cid, t in self.tables.items():
+            self._count[cid] = len(t.players)
+            self._by_count[len(t.players)].add(cid)
+            self._idle_by_count[len(t.players)].add(cid)
+
+    # ---- bookkeeping ----
+    @property
+    def remaining(self):
+        return self._remaining
+
+    @property
+    def finished(self):
+        return self.remaining <= 1
+
+    def _set_count(self, cid, n):
+        old = self._count[cid]
+        self._by_count[old].discard(cid)
+        self._idle_by_count[old].discard(cid)
+        self._count[cid] = n
+        self._by_count[n].add(cid)
+        if cid not in self._busy:
+            self._idle_by_count[n].add(cid)
+
+    def _set_busy(self, cid, busy):
+        if busy:
+            self._busy.add(cid)
+            self._idle_by_count[self._count[cid]].discard(cid)
+        else:
+            self._busy.discard(cid)
+            self._idle_by_count[self._count[cid]].add(cid)
+
+    def _extreme(self, largest, idle_only=False):
+        buckets = self._idle_by_count if idle_only else self._by_count
+        counts = range(self.seats, -1, -1) if largest else range(self.seats + 1)
+        for n in counts:
+            cid = buckets[n].any()
+            if cid is not None:
+                return cid
+        return None
+
+    # ---- blind clock ----
+    def tick(self, now=None):
+        """Apply the clock's current level to every table. Returns the new level if it changed."""
+        level = self.clock.level_at(time.monotonic() if now is None else now)
+        if level == self.level:
+            return None
+        self.level = level
+        sb, bb = self.clock.levels[level]
+        for t in self.tables.values():
+            t.sb, t.bb = sb, bb
+        return level
+
+    async def run_clock(self, on_level=None):
+        """Single scheduler task that advances blinds on all tables."""
+        while not self.finished:
+            await asyncio.sleep(self.clock.seconds_to_next(time.monotonic()))
+            level = self.tick()
+            if level is not None and on_level:
+                await on_level(level, *self.clock.levels[level])
+
+    # ---- hand lifecycle ----
+    def seat_arrivals(self, cid):
+        """Seat players moved here since the last hand. Call before `begin_hand`; marks the table busy."""
+        t = self.tables[cid]
+        self._set_busy(cid, True)
+        for p in self._arrivals[cid]:
+            # sit behind the button so they don't skip the blinds
+            t.players.insert(t.dealer_idx, p)
+            t.dealer_idx += 1
+        self._arrivals[cid] = []
+
+    def hand_complete(self, cid):
+        """
+        Remove busted players from a table that just finished a hand and rebalance.
+        Returns (busted players, moves) where moves are (player, from_channel, to_channel).
+        """
+        t = self.tables[cid]
+        busted = [p for p in t.players if p.stack == 0]
+        for p in busted:
+            self._remove(t, p)
+        self.finish_order.extend(busted)
+        self._remaining -= len(busted)
+        self._set_count(cid, self._count[cid] - len(busted))
+        self._set_busy(cid, False)
+        return busted, self.rebalance()
+
+    def rebalance(self):
+        moves = []
+        while len(self.tables) > 1:
+            if self.remaining <= (len(self.tables) - 1) * self.seats:
+                src = self._extreme(largest=False, idle_only=True)
+                if src is None:
+                    break
+                moves += self._break_table(src)
+                continue
+            lo = self._extreme(largest=False)
+            hi = self._extreme(largest=True, idle_only=True)
+            if hi is None or self._count[hi] - self._count[lo] <= 1:
+                break
+            p = self._take_next_big_blind(self.tables[hi])
+            moves.append(self._seat(p, hi, lo))
+        return moves
+
+    def _break_table(self, src):
+        t = self.tables[src]
+        players = t.players[:] + self._arrivals.pop(src)
+        t.players = []
+        n = self._count.pop(src)
+        self._by_count[n].discard(src)
+        self._idle_by_count[n].discard(src)
+        self._busy.discard(src)
+        del self.tables[src]
+        self.tables_broken += 1
+        moves = []
+        for p in players:
+            moves.append(self._seat(p, src, self._extreme(largest=False)))
+        return moves
+
+    def _seat(self, p, src, dst):
+        if src in self._count:
+            self._set_count(src, self._count[src] - 1)
+        self._arrivals[dst].append(p)
+        self._set_count(dst, self._count[dst] + 1)
+        self.moves += 1
+        return p, src, dst
+
+    def _take_next_big_blind(self, t):
+        if not t.players:
+            return self._arrivals[t.channel_id].pop()
+        idx = (t.dealer_idx + 2) % len(t.players)
+        p = t.players[idx]
+        self._remove(t, p)
+        return p
+
+    @staticmethod
+    def _remove(t, p):
+        idx = t.players.index(p)
+        t.players.pop(idx)
+        if idx < t.dealer_idx:
+            t.dealer_idx -= 1
+        if t.players:
+            t.dealer_idx %= len(t.players)
+        else:
+            t.dealer_idx = 0
+
+    def standings(self):
+        """Finishing order, winner first."""
+        alive = [p for t in self.tables.values() for p in t.players]
+        alive += [p for arrivals in self._arrivals.values() for p in arrivals]
+        return alive + self.finish_order[::-1]
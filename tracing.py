@@ -0,0 +1,148 @@
+"""
+Lightweight action tracing and an on-demand sampling profiler.
+
+Every command/button runs inside an ActionTrace. Code marks the end of local
+stages with `mark("validate")` and wraps awaited Discord calls and heavy work
+in `with span("send"):`. Outside an action both are a single context-var lookup.
+Actions whose busy time (everything except `wait:` spans such as the pause
+before the next hand) exceeds SLOW_ACTION_MS are logged with their breakdown.
+"""
+import contextvars
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+log = logging.getLogger("pokerbot.trace")
+SLOW_ACTION_MS = float(os.getenv("POKER_SLOW_ACTION_MS", "500"))
+
+_current = contextvars.ContextVar("action_trace", default=None)
+
+
+class ActionTrace:
+    def __init__(self, name):
+        self.name = name
+        self.start = self.last = time.perf_counter()
+        self.stages: list[tuple[str, float]] = []  # (stage, seconds) in order
+        self.done = False
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def busy(self):
+        return sum(sec for stage, sec in self.stages if not stage.startswith("wait:"))
+
+    def breakdown(self):
+        return " | ".join(
+            f"{stage} {sec * 1000:.1f}ms" for stage, sec in self.stages
+            if stage != "handler" or sec >= 0.0001  # skip empty gaps between spans
+        )
+
+
+def mark(stage):
+    """Attribute time since the previous mark/span to `stage` (e.g. 'validate', 'mutate')."""
+    trace = _current.get()
+    if trace is not None and not trace.done:
+        trace.mark(stage)
+
+
+class span:
+    """Time a block (usually one awaited Discord call) as its own stage of the current action."""
+    __slots__ = ("stage", "trace")
+
+    def __init__(self, stage):
+        self.stage = stage
+        trace = _current.get()
+        self.trace = trace if trace is not None and not trace.done else None
+
+    def __enter__(self):
+        if self.trace is not None:
+            self.trace.mark("handler")
+        return self
+
+    def __exit__(self, *exc):
+        if self.trace is not None:
+            self.trace.mark(self.stage)
+        return False
+
+
+def traced(name):
+    """
+    Run a command/button callback as an action. Nested callbacks join the outer action;
+    tasks started with spawn() (auto-muck, bot turns) start their own.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            outer = _current.get()
+            if outer is not None and not outer.done:
+                return await func(*args, **kwargs)
+            trace = ActionTrace(name)
+            token = _current.set(trace)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                trace.mark("handler")
+                trace.done = True
+                _current.reset(token)
+                if trace.busy() * 1000 >= SLOW_ACTION_MS:
+                    log.warning("slow action %s: %.1fms busy | %s", name, trace.busy() * 1000, trace.breakdown())
+        return wrapper
+    return decorator
+
+
+def spawn(loop, coro):
+    """
+    create_task outside the current action. A plain task copies the context, so a
+    bot turn started mid-command would book its think time to the human's action.
+    """
+    context = contextvars.copy_context()
+    context.run(_current.set, None)
+    return loop.create_task(coro, context=context)
+
+
+# ===== Sampling profiler =====
+class SamplingProfiler:
+    """
+    Samples every thread's Python stack from a background thread and
+    aggregates them in folded-stack format ("a;b;c count"), which
+    flamegraph.pl, speedscope and inferno read directly.
+    """
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
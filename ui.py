@@ -1,17 +1,20 @@
 import discord
 from discord.ui import View, button
+import tracing
 
 class InteractionContext:
     """Shim to make a discord.Interaction look like a commands.Context for our commands."""
     def __init__(self, interaction: discord.Interaction):
         self.interaction = interaction
         self.author = interaction.user
+        self.bot = interaction.client
         self.channel = interaction.channel
         self.guild = interaction.guild
 
     async def send(self, *args, **kwargs):
         # forward to channel instead of ephemeral
-        return await self.channel.send(*args, **kwargs)
+        with tracing.span("send"):
+            return await self.channel.send(*args, **kwargs)
 
 
 class ActionView(View):
@@ -25,28 +28,34 @@ class ActionView(View):
         """Ensure only the current player can act."""
         current = self.table.players[self.table.turn_idx]
         if interaction.user.id != current.user_id:
-            await interaction.response.send_message("Not your turn!", ephemeral=True)
+            with tracing.span("response"):
+                await interaction.response.send_message("Not your turn!", ephemeral=True)
             return False
         # disable old buttons immediately so they can't be spammed
         for child in self.children:
             child.disabled = True
-        await interaction.message.edit(view=self)
+        tracing.mark("validate")
+        with tracing.span("message.edit"):
+            await interaction.message.edit(view=self)
         return True
 
     # ---- Buttons ----
     @button(label="Check", style=discord.ButtonStyle.secondary)
+    @tracing.traced("button:check")
     async def check_btn(self, interaction: discord.Interaction, _):
         if not await self._check_turn(interaction): return
         ctx = InteractionContext(interaction)
         await self.bot.get_command("check").callback(ctx)
 
     @button(label="Call", style=discord.ButtonStyle.primary)
+    @tracing.traced("button:call")
     async def call_btn(self, interaction: discord.Interaction, _):
         if not await self._check_turn(interaction): return
         ctx = InteractionContext(interaction)
         await self.bot.get_command("call").callback(ctx)
 
     @button(label="1/3 Pot", style=discord.ButtonStyle.success)
+    @tracing.traced("button:1/3 pot")
     async def pot_third_btn(self, interaction: discord.Interaction, _):
         if not await self._check_turn(interaction): return
         amt = max(1, self.table.pot // 3)
@@ -54,6 +63,7 @@ class ActionView(View):
         await self.bot.get_command("raise").callback(ctx, amt)
 
     @button(label="1/2 Pot", style=discord.ButtonStyle.success)
+    @tracing.traced("button:1/2 pot")
     async def pot_half_btn(self, interaction: discord.Interaction, _):
         if not await self._check_turn(interaction): return
         amt = max(1, self.table.pot // 2)
@@ -61,6 +71,7 @@ class ActionView(View):
         await self.bot.get_command("raise").callback(ctx, amt)
 
     @button(label="3/4 Pot", style=discord.ButtonStyle.success)
+    @tracing.traced("button:3/4 pot")
     async def pot_three_quarter_btn(self, interaction: discord.Interaction, _):
         if not await self._check_turn(interaction): return
         amt = max(1, (self.table.pot * 3) // 4)
@@ -68,6 +79,7 @@ class ActionView(View):
         await self.bot.get_command("raise").callback(ctx, amt)
 
     @button(label="Pot", style=discord.ButtonStyle.success)
+    @tracing.traced("button:pot")
     async def pot_full_btn(self, interaction: discord.Interaction, _):
         if not await self._check_turn(interaction): return
         amt = max(1, self.table.pot)
@@ -75,12 +87,14 @@ class ActionView(View):
         await self.bot.get_command("raise").callback(ctx, amt)
 
     @button(label="All-In", style=discord.ButtonStyle.danger)
+    @tracing.traced("button:all-in")
     async def allin_btn(self, interaction: discord.Interaction, _):
         if not await self._check_turn(interaction): return
         ctx = InteractionContext(interaction)
         await self.bot.get_command("allin").callback(ctx)
 
     @button(label="Fold", style=discord.ButtonStyle.secondary)
+    @tracing.traced("button:fold")
     async def fold_btn(self, interaction: discord.Interaction, _):
         if not await self._check_turn(interaction): return
         ctx = InteractionContext(interaction)
@@ -92,7 +106,7 @@ class ActionView(View):
         """Show help info to any user, regardless of turn."""
         help_text = (
             "**📖 Poker Bot Commands**\n"
-            "`!poker start <sb> <bb> <min> <max>` – Create a table\n"
+            "`!poker start <sb> <bb> <min> <max> [holdem|plo|shortdeck]` – Create a table\n"
             "`!poker join` – Sit at the table\n"
             "`!poker buyin <amount>` – Buy chips\n"
             "`!poker begin` – Start a hand\n"
@@ -1,11 +1,13 @@
-import random
+import asyncio
 import discord
+import shuffle
+import tracing
+from variants import HOLDEM
 
 # ===== Cards & images =====
-def deal_deck():
-    deck = [(r, s) for r in range(13) for s in range(4)]
-    random.shuffle(deck)
-    return deck
+def deal_deck(variant=None):
+    """(seed, deck) for the next hand, pre-shuffled by the shuffle service."""
+    return shuffle.deal(variant or HOLDEM)
 
 def card_code(ri, si):
     rank_map = ['2','3','4','5','6','7','8','9','T','J','Q','K','A']
@@ -15,6 +17,29 @@ def card_code(ri, si):
 def code_to_url(code):
     return f"https://deckofcardsapi.com/static/img/{code}.png"
 
+def board_embeds(cards):
+    """One image embed per card, for sending several cards in a single message (max 10)."""
+    return [discord.Embed().set_image(url=code_to_url(card_code(*card))) for card in cards]
+
 async def send_board_images(ctx, cards):
     for card in cards:
         await ctx.send(embed=discord.Embed().set_image(url=code_to_url(card_code(*card))))
+
+async def dm_hand_strength(ctx, t):
+    """DM each live human player what they currently hold, e.g. 'Flop: Top Pair + Flush Draw'. DMs go out concurrently."""
+    async def dm(member, text):
+        try:
+            await member.send(text)
+        except Exception:
+            pass
+
+    sends = []
+    for p in t.players:
+        if p.folded or p.is_bot or p.user_id not in t.strength:
+            continue
+        member = ctx.guild.get_member(p.user_id)
+        if member:
+            sends.append(dm(member, f"{t.street.capitalize()}: you have {t.strength[p.user_id].describe()}"))
+    if sends:
+        with tracing.span("dm"):
+            await asyncio.gather(*sends)
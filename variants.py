@@ -0,0 +1,245 @@
+"""
+Game variants and their hand-ranking lookup tables.
+
+Every variant's 5-card table comes from the same builder: each rank multiset is
+keyed by the product of one prime per rank (order-free, so no sorting when
+combining cards), and maps to an integer strength plus the familiar score tuple
+and hand name. Flushes use a second table with the same keys.
+"""
+from itertools import combinations, combinations_with_replacement
+from hand_evaluator import CATEGORY_NAMES, best_hand, evaluate_7
+from hand_evaluator import evaluate_batch as holdem_batch
+
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]  # one per rank index 2..A
+
+# Hold'em category numbers (as in hand_evaluator) -> this variant's category value
+HOLDEM_ORDER = list(range(9))
+SHORT_DECK_ORDER = [0, 1, 2, 3, 4, 6, 5, 7, 8]  # flush (5) beats full house (6)
+
+
+def _pieces(cards, n, mixed):
+    """(prime product, suit) for every n-card subset of `cards`; `mixed` stands in for the suit when they differ."""
+    if n == 1:
+        return [(PRIMES[r], s) for r, s in cards]
+    if n == 2:  # hole-card pairs: built once per player, so skip the general loop
+        return [(PRIMES[a[0]] * PRIMES[b[0]], a[1] if a[1] == b[1] else mixed)
+                for a, b in combinations(cards, 2)]
+    pieces = []
+    for combo in combinations(cards, n):
+        key = 1
+        suit = combo[0][1]
+        for r, s in combo:
+            key *= PRIMES[r]
+            if s != suit:
+                suit = mixed
+        pieces.append((key, suit))
+    return pieces
+
+def _straights(ranks, wheel):
+    """{frozenset of rank values: high card} for every 5-card straight in `ranks`."""
+    values = sorted(r + 2 for r in ranks)
+    found = {frozenset(values[i:i + 5]): values[i + 4]
+             for i in range(len(values) - 4) if values[i + 4] - values[i] == 4}
+    found[frozenset(wheel)] = max(v for v in wheel if v != 14)
+    return found
+
+def _classify(values, flush, straights):
+    """Hold'em category and tiebreak ranks for 5 rank values (2-14), mirroring evaluate_5."""
+    values = sorted(values, reverse=True)
+    counts = {v: values.count(v) for v in set(values)}
+    ordered = sorted(counts.items(), key=lambda x: (-x[1], -x[0]))
+    high = straights.get(frozenset(values)) if len(counts) == 5 else None
+
+    if high and flush:
+        return 8, (high,)
+    if ordered[0][1] == 4:
+        return 7, (ordered[0][0], ordered[1][0])
+    if ordered[0][1] == 3 and ordered[1][1] == 2:
+        return 6, (ordered[0][0], ordered[1][0])
+    if flush:
+        return 5, tuple(values)
+    if high:
+        return 4, (high,)
+    if ordered[0][1] == 3:
+        return 3, (ordered[0][0], *[v for v in values if v != ordered[0][0]][:2])
+    if ordered[0][1] == 2 and ordered[1][1] == 2:
+        return 2, (ordered[0][0], ordered[1][0], ordered[2][0])
+    if ordered[0][1] == 2:
+        return 1, (ordered[0][0], *[v for v in values if v != ordered[0][0]])
+    return 0, tuple(values)
+
+def build_tables(ranks, order, wheel):
+    """
+    Shared table builder. Returns (plain, flush, scores): `plain`/`flush` map a
+    prime-product key to an integer strength (higher wins); `scores[strength]`
+    is (score tuple, hand name).
+    """
+    straights = _straights(ranks, wheel)
+    entries = []  # (score, name, key, is_flush)
+    for combo in combinations_with_replacement(ranks, 5):
+        if any(combo.count(r) > 4 for r in combo):
+            continue
+        key = 1
+        for r in combo:
+            key *= PRIMES[r]
+        values = [r + 2 for r in combo]
+        for flush in ([False, True] if len(set(combo)) == 5 else [False]):
+            cat, tiebreak = _classify(values, flush, straights)
+            entries.append(((order[cat], *tiebreak), CATEGORY_NAMES[cat], key, flush))
+
+    distinct = sorted({e[0] for e in entries})
+    strength = {score: i for i, score in enumerate(distinct)}
+    names = {e[0]: e[1] for e in entries}
+    plain, flush = {}, {}
+    for score, _, key, is_flush in entries:
+        (flush if is_flush else plain)[key] = strength[score]
+    return plain, flush, [(score, names[score]) for score in distinct]
+
+
+class Variant:
+    """A poker game: its deck, hole-card count, betting limit and hand ranking."""
+    def __init__(self, key, name, ranks, hole_cards, order=HOLDEM_ORDER, wheel=(14, 2, 3, 4, 5),
+                 exact_hole=None, pot_limit=False):
+        self.key = key
+        self.name = name
+        self.ranks = list(ranks)
+        self.hole_cards = hole_cards
+        self.order = order
+        self.wheel = wheel
+        self.exact_hole = exact_hole  # Omaha: must play exactly this many hole cards
+        self.pot_limit = pot_limit
+        self._tables = None
+
+    def deck(self):
+        return [(r, s) for r in self.ranks for s in range(4)]
+
+    @property
+    def tables(self):
+        if self._tables is None:
+            self._tables = build_tables(self.ranks, self.order, self.wheel)
+        return self._tables
+
+    # ---- 5-card lookups ----
+    def strength_5(self, cards):
+        plain, flush, _ = self.tables
+        key = 1
+        for r, _s in cards:
+            key *= PRIMES[r]
+        s0 = cards[0][1]
+        if all(s == s0 for _r, s in cards):
+            return flush[key]
+        return plain[key]
+
+    def evaluate_5(self, cards):
+        """(score, name) of exactly 5 cards."""
+        return self.tables[2][self.strength_5(cards)]
+
+    # ---- best hand ----
+    def strength(self, hole, board):
+        """Integer strength of the best legal 5-card hand (comparable within this variant)."""
+        if self.exact_hole:
+            return self._omaha_strength(hole, board)
+        plain, flush, _ = self.tables
+        cards = hole + board
+        primes = [PRIMES[r] for r, _s in cards]
+        suits = [s for _r, s in cards]
+        best = -1
+        for a, b, c, d, e in combinations(range(len(cards)), 5):
+            key = primes[a] * primes[b] * primes[c] * primes[d] * primes[e]
+            if suits[a] == suits[b] == suits[c] == suits[d] == suits[e]:
+                s = flush[key]
+            else:
+                s = plain[key]
+            if s > best:
+                best = s
+        return best
+
+    def _omaha_strength(self, hole, board):
+        # Combine precomputed (prime product, suit) pieces: 6 hole pairs x 10 board triples,
+        # no sorting and only one multiply + dict lookup per combination.
+        plain, flush, _ = self.tables
+        pairs = [(PRIMES[a[0]] * PRIMES[b[0]], a[1] if a[1] == b[1] else -1)
+                 for a, b in combinations(hole, self.exact_hole)]
+        triples = [(PRIMES[a[0]] * PRIMES[b[0]] * PRIMES[c[0]], a[1] if a[1] == b[1] == c[1] else -2)
+                   for a, b, c in combinations(board, 5 - self.exact_hole)]
+        best = -1
+        for pk, ps in pairs:
+            for tk, ts in triples:
+                s = flush[pk * tk] if ps == ts else plain[pk * tk]
+                if s > best:
+                    best = s
+        return best
+
+    def _board_pieces(self, board):
+        """
+        Everything about `board` a player's best hand needs: the strength of
+        the board alone (if it may play) and the (prime product, suit) of every
+        board subset that can join hole cards, keyed by how many hole cards
+        complete it. Shared by every player on the same board.
+        """
+        takes = [self.exact_hole] if self.exact_hole else range(1, self.hole_cards + 1)
+        pieces = [(k, _pieces(board, 5 - k, -2)) for k in takes if 5 - k <= len(board)]
+        alone = -1
+        if not self.exact_hole and len(board) >= 5:
+            alone = max(self.strength_5(c) for c in combinations(board, 5))
+        return alone, pieces
+
+    def _strength_on(self, hole, board_pieces):
+        # strength() with the board's half of every combination already multiplied out
+        plain, flush, _ = self.tables
+        best, pieces = board_pieces
+        for k, board_part in pieces:
+            for pk, ps in _pieces(hole, k, -1):
+                for tk, ts in board_part:
+                    s = flush[pk * tk] if ps == ts else plain[pk * tk]
+                    if s > best:
+                        best = s
+        return best
+
+    def score(self, hole, board):
+        """Best hand's score tuple."""
+        if self is HOLDEM:
+            return evaluate_7(hole + board)
+        return self.tables[2][self.strength(hole, board)][0]
+
+    def best(self, hole, board):
+        """(score, best5, name) like hand_evaluator.best_hand, honouring this variant's rules."""
+        if self is HOLDEM:
+            return best_hand(hole + board)
+        if self.exact_hole:
+            combos = (h + b for h in combinations(hole, self.exact_hole)
+                      for b in combinations(board, 5 - self.exact_hole))
+        else:
+            combos = combinations(hole + board, 5)
+        best5 = max(combos, key=self.strength_5)
+        score, name = self.evaluate_5(best5)
+        return score, best5, name
+
+    def name_of(self, score):
+        """Hand name for a score tuple from this variant (categories are remapped in short deck)."""
+        return CATEGORY_NAMES[self.order.index(score[0])]
+
+    def evaluate_batch(self, hands):
+        """
+        Score many (hole, board) pairs. Consecutive pairs on the same board
+        (every player on one runout) share that board's work.
+        """
+        if self is HOLDEM:
+            return holdem_batch(hands)
+        scores = self.tables[2]
+        out = []
+        last = None
+        for hole, board in hands:
+            if board is not last:
+                last = board
+                pieces = self._board_pieces(board)
+            out.append(scores[self._strength_on(hole, pieces)][0])
+        return out
+
+
+HOLDEM = Variant("holdem", "Texas Hold'em", range(13), 2)
+SHORT_DECK = Variant("shortdeck", "6+ Short Deck Hold'em", range(4, 13), 2,
+                     order=SHORT_DECK_ORDER, wheel=(14, 6, 7, 8, 9))
+PLO = Variant("plo", "Pot-Limit Omaha", range(13), 4, exact_hole=2, pot_limit=True)
+
+VARIANTS = {v.key: v for v in (HOLDEM, SHORT_DECK, PLO)}